@@ -0,0 +1,127 @@
+import argparse
+import os
+import pathlib
+import sys
+import time
+from typing import Callable, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from table_extractor import TableExtractor, TranscriptTableLocator
+
+
+def legacy_extract_transcript(driver, locator: TranscriptTableLocator) -> List[List[str]]:
+    """
+    Extract the transcript table rows one WebDriver call per table, per row and per cell,
+    as the scraper used to.
+
+    Parameters:
+        driver: Selenium WebDriver instance.
+        locator (TranscriptTableLocator): Picks the transcript table by its header.
+
+    Returns:
+        List[List[str]]: The rows following the transcript header, or an empty list.
+    """
+    from selenium.webdriver.common.by import By
+
+    tables = [
+        [
+            [cell.text for cell in row.find_elements(By.XPATH, "./td | ./th")]
+            for row in table.find_elements(By.XPATH, "./tr | ./*/tr")
+        ]
+        for table in driver.find_elements(By.TAG_NAME, "table")
+    ]
+    return locator.locate(tables) or []
+
+
+def time_call(label: str, func: Callable[[], List[List[str]]], repeat: int):
+    """
+    Run the given extraction several times and print its best and mean timings.
+
+    Parameters:
+        label (str): The name printed next to the timings.
+        func (Callable): The extraction to benchmark.
+        repeat (int): How many times the extraction runs.
+
+    Returns:
+        List[List[str]]: The table data returned by the last run.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        table_data = func()
+        timings.append(time.perf_counter() - start)
+    print(
+        f"{label:<14} best {min(timings) * 1000:9.2f} ms   "
+        f"mean {sum(timings) / len(timings) * 1000:9.2f} ms   rows {len(table_data)}"
+    )
+    return table_data
+
+
+def start_driver():
+    """
+    Start a headless Chrome used to replay the saved pages.
+
+    Returns:
+        webdriver.Chrome: The started driver.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    return webdriver.Chrome(options=options)
+
+
+def main():
+    """
+    Benchmark every extraction path on the given saved transcript pages.
+    """
+    parser = argparse.ArgumentParser(
+        description="Compare the per-cell Selenium extraction with the single round-trip extractors."
+    )
+    parser.add_argument("pages", nargs="+", help="Saved transcript HTML files.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--no-browser",
+        action="store_true",
+        help="Only benchmark the HTML parser, without starting Chrome.",
+    )
+    args = parser.parse_args()
+
+    extractor = TableExtractor()
+    driver = None if args.no_browser else start_driver()
+    try:
+        for page in args.pages:
+            path = pathlib.Path(page).resolve()
+            html = path.read_text(encoding="utf-8", errors="replace")
+            print(f"\n{path.name}")
+            parsed = time_call(
+                "html parser",
+                lambda: extractor.extract_transcript_from_html(html),
+                args.repeat,
+            )
+            if driver is None:
+                continue
+            driver.get(path.as_uri())
+            legacy = time_call(
+                "legacy",
+                lambda: legacy_extract_transcript(driver, extractor.locator),
+                args.repeat,
+            )
+            script = time_call(
+                "execute_script",
+                lambda: extractor.extract_transcript(driver),
+                args.repeat,
+            )
+            print(f"execute_script matches legacy: {script == legacy}")
+            print(f"html parser matches legacy:    {parsed == legacy}")
+    finally:
+        if driver:
+            driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -47,7 +47,7 @@ def write_to_yaml(file_path, data) -> bool:
     bool: The success.
     """
     try:
-        with open(file_path, "w") as config_file:
+        with open(file_path, "w", encoding="utf-8") as config_file:
             yaml.dump(
                 data,
                 config_file,
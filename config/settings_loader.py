@@ -18,5 +18,5 @@ def load_settings(config_file: str = None) -> dict:
             )
         else:
             config_file = os.path.join(os.path.dirname(__file__), "config.yaml")
-    with open(config_file, "r") as file:
+    with open(config_file, "r", encoding="utf-8") as file:
         return yaml.safe_load(file)
@@ -1,15 +1,24 @@
+import atexit
 import logging
 import os
+import queue
+import random
 import sys
-from typing import Literal
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Literal, Optional, Union
 
 from config import config
 
+PAYLOAD_MODES = ("full", "sampled", "off")
+
 
 class Logger:
     """
     A class to handle logging with different log types.
 
+    Records are handed to a queue and written to disk by a background listener thread, so
+    logging never blocks the caller on file I/O.
+
     Attributes:
     LOG_DIR (str): The directory where log files will be stored.
     GENERAL_LOG_FILE (str): Base filename for general log files.
@@ -33,8 +42,73 @@ class Logger:
         self.LOG_FILE_EXTENSION = config["log"]["log_file_extension"]
         self.GENERAL_LOG_FILE = config["log"]["general_log_file"]
         self.RETURN_LOG_FILE = config["log"]["return_log_file"]
+        self.LEVEL = logging.getLevelName(config["log"].get("level", "INFO"))
+        self.PAYLOAD_MODE = config["log"].get("payloads", "full")
+        self.PAYLOAD_SAMPLE_RATE = config["log"].get("payload_sample_rate", 0.1)
+        if self.PAYLOAD_MODE not in PAYLOAD_MODES:
+            raise ValueError(
+                f"Unknown payload logging mode '{self.PAYLOAD_MODE}'. Use one of {PAYLOAD_MODES}."
+            )
         self.logger = self._setup_logger()
 
+    def log(
+        self, level: int, message: Union[str, Callable[[], str]], *args: Any
+    ) -> None:
+        """
+        Log a message only rendering it if the level is enabled.
+
+        Parameters:
+        level (int): The logging level.
+        message (str | Callable[[], str]): A %-style format string, filled with `args` by the
+            logging module, or a callable building the message.
+        args: The arguments of the format string.
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+        if callable(message):
+            message = message()
+        self.logger.log(level, message, *args, stacklevel=2)
+
+    def sample_payload(self) -> bool:
+        """
+        Decide if the payloads of one operation are logged, according to the payload mode.
+
+        The "full" mode logs every payload, "sampled" only a fraction given by
+        `payload_sample_rate` and "off" none.
+
+        Returns:
+        bool: True if the payloads must be logged.
+        """
+        if self.PAYLOAD_MODE == "sampled":
+            return random.random() < self.PAYLOAD_SAMPLE_RATE
+        return self.PAYLOAD_MODE == "full"
+
+    def payload(
+        self,
+        message: Union[str, Callable[[], str]],
+        *args: Any,
+        sampled: Optional[bool] = None,
+    ) -> None:
+        """
+        Log a request, response or table dump at INFO level, according to the payload mode.
+
+        Skipped payloads are never rendered. The request and the response of one operation
+        share the decision of `sample_payload`, so sampled logs keep both halves.
+
+        Parameters:
+        message (str | Callable[[], str]): A %-style format string or a callable building the message.
+        args: The arguments of the format string.
+        sampled (Optional[bool]): The decision of `sample_payload` for the operation. Taken
+            for this payload alone if None.
+        """
+        if sampled is None:
+            sampled = self.sample_payload()
+        if not sampled or not self.logger.isEnabledFor(logging.INFO):
+            return
+        if callable(message):
+            message = message()
+        self.logger.info(message, *args, stacklevel=2)
+
     def _setup_logger(self) -> logging.Logger:
         """
         Set up the logger with specified log type.
@@ -53,14 +127,18 @@ class Logger:
         logger = logging.getLogger(self.log_type)
 
         if not logger.hasHandlers():
-            logger.setLevel(logging.INFO)
+            logger.setLevel(self.LEVEL)
             file_handler = logging.FileHandler(
                 self._get_segmented_log_filename(log_file_path), encoding="utf-8"
             )
             file_handler.setFormatter(
                 logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
             )
-            logger.addHandler(file_handler)
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            listener = QueueListener(log_queue, file_handler)
+            listener.start()
+            atexit.register(listener.stop)
+            logger.addHandler(QueueHandler(log_queue))
             logger.propagate = False
 
         return logger
@@ -0,0 +1,158 @@
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Optional
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import siac_login
+from config import config
+from driver_pool import get_driver_pool
+from logs import general_log
+from scraper import Scraper
+from transcript_schema import apply_transcript_schema
+
+STUDENT_COLUMN = "CPF"
+
+
+@dataclass
+class BatchResult:
+    """
+    The outcome of a batch scraping run.
+
+    Attributes:
+        data (pd.DataFrame): The transcripts of every successful student, keyed by the CPF column.
+        failures (dict[str, str]): The error message of every student that failed, keyed by CPF.
+        elapsed (float): The wall-clock duration of the run in seconds.
+    """
+
+    data: pd.DataFrame
+    failures: dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def students_per_minute(self) -> float:
+        """
+        Return the aggregate throughput of the run.
+
+        Returns:
+            float: The number of students processed per minute.
+        """
+        processed = self.data[STUDENT_COLUMN].nunique() if not self.data.empty else 0
+        processed += len(self.failures)
+        return processed * 60 / self.elapsed if self.elapsed else 0.0
+
+
+def load_credentials(file_path: str) -> list[tuple[str, str]]:
+    """
+    Load the students' credentials from a CSV file with `cpf` and `password` columns.
+
+    Parameters:
+        file_path (str): The path to the CSV file.
+
+    Returns:
+        list[tuple[str, str]]: The (CPF, password) pairs.
+    """
+    with open(file_path, newline="", encoding="utf-8") as file:
+        return [(row["cpf"].strip(), row["password"]) for row in csv.DictReader(file)]
+
+
+def scrape_student(cpf: str, password: str) -> pd.DataFrame:
+    """
+    Log in with the given credentials and scrape the student's transcript.
+
+    Each call owns its own driver or HTTP session, which `Scraper.scrape_table` closes.
+
+    Parameters:
+        cpf (str): CPF of the student.
+        password (str): Password of the student.
+
+    Returns:
+        pd.DataFrame: The student's transcript, with the CPF column prepended.
+    """
+    driver = siac_login.login(cpf, password)
+    df = Scraper(driver, cpf).scrape_table()
+    df.insert(0, STUDENT_COLUMN, cpf)
+    return df
+
+
+def run_batch(
+    credentials: list[tuple[str, str]], concurrency: Optional[int] = None
+) -> BatchResult:
+    """
+    Scrape every student concurrently with a bounded pool of workers.
+
+    With the selenium backend, the driver pool is grown to one browser per worker so no
+    worker waits for another to release its browser. A failing student is logged and
+    recorded in the result without affecting the others.
+
+    Parameters:
+        credentials (list[tuple[str, str]]): The (CPF, password) pairs to scrape.
+        concurrency (Optional[int]): The number of workers. Defaults to `batch.concurrency` in the config.
+
+    Returns:
+        BatchResult: The merged transcripts, the failures and the throughput of the run.
+    """
+    concurrency = concurrency or config.get("batch", {}).get("concurrency", 4)
+    if config.get("scraper", {}).get("backend", "selenium") == "selenium":
+        get_driver_pool().grow(concurrency)
+    general_log.logger.info(
+        f"Starting batch scraping of {len(credentials)} students with {concurrency} workers."
+    )
+    frames, failures = [], {}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(scrape_student, cpf, password): cpf
+            for cpf, password in credentials
+        }
+        for future in as_completed(futures):
+            cpf = futures[future]
+            try:
+                frames.append(future.result())
+                general_log.logger.info(f"Scraped student {cpf}.")
+            except Exception as e:
+                failures[cpf] = str(e)
+                general_log.logger.error(f"Failed to scrape student {cpf}: {e}")
+
+    data = (
+        apply_transcript_schema(pd.concat(frames, ignore_index=True))
+        if frames
+        else pd.DataFrame()
+    )
+    result = BatchResult(data, failures, time.perf_counter() - start)
+    general_log.logger.info(
+        f"Batch finished in {result.elapsed:.1f}s: {len(frames)} succeeded, "
+        f"{len(failures)} failed, {result.students_per_minute:.1f} students/min."
+    )
+    return result
+
+
+def main():
+    """
+    Command line entry point to scrape a whole cohort from a credentials file.
+    """
+    parser = argparse.ArgumentParser(description="Scrape several SIAC students at once.")
+    parser.add_argument("credentials", help="CSV file with cpf and password columns.")
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--output", default="cohort.csv", help="CSV output file.")
+    args = parser.parse_args()
+
+    result = run_batch(load_credentials(args.credentials), args.concurrency)
+    result.data.to_csv(args.output, index=False)
+    print(
+        f"{len(result.data)} rows written to {args.output}; "
+        f"{len(result.failures)} failures; {result.students_per_minute:.1f} students/min."
+    )
+    for cpf, error in result.failures.items():
+        print(f"{cpf}: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import os
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from logs import general_log
+
+KEY_COLUMNS = ["CÓDIGO", "PERÍODO"]
+IGNORED_COLUMNS = ["CPF"]
+
+
+@dataclass
+class TranscriptChanges:
+    """
+    The differences between two scrapes of the same transcript.
+
+    Attributes:
+        inserted (pd.DataFrame): Current rows whose (CÓDIGO, PERÍODO) key is new.
+        changed (pd.DataFrame): Current rows whose key existed with different values.
+        removed (pd.DataFrame): Previous rows whose key disappeared.
+    """
+
+    inserted: pd.DataFrame
+    changed: pd.DataFrame
+    removed: pd.DataFrame
+
+    @property
+    def codes(self) -> set[str]:
+        """
+        Return every course code touched by an insertion, a change or a removal.
+
+        Returns:
+            set[str]: The affected codes.
+        """
+        return {
+            str(code)
+            for frame in (self.inserted, self.changed, self.removed)
+            for code in frame["CÓDIGO"].dropna().unique()
+        }
+
+    def is_empty(self) -> bool:
+        """
+        Check if both scrapes are identical.
+
+        Returns:
+            bool: True if nothing was inserted, changed or removed.
+        """
+        return self.inserted.empty and self.changed.empty and self.removed.empty
+
+
+def _row_hashes(df: pd.DataFrame) -> pd.Series:
+    """
+    Hash the values of every row, indexed by its (CÓDIGO, PERÍODO, occurrence) key.
+
+    The occurrence counter tells apart repeated attempts of a code within one period.
+
+    Parameters:
+        df (pd.DataFrame): The transcript DataFrame.
+
+    Returns:
+        pd.Series: The row hashes, in the order of the rows of `df`.
+    """
+    keys = df[KEY_COLUMNS].astype(str)
+    occurrence = keys.groupby(KEY_COLUMNS, sort=False).cumcount()
+    value_columns = [
+        column
+        for column in df.columns
+        if column not in KEY_COLUMNS + IGNORED_COLUMNS and column != "RES_PRIORITY"
+    ]
+    hashes = pd.util.hash_pandas_object(df[value_columns].astype(str), index=False)
+    hashes.index = pd.MultiIndex.from_arrays(
+        [keys[KEY_COLUMNS[0]], keys[KEY_COLUMNS[1]], occurrence],
+        names=KEY_COLUMNS + ["OCCURRENCE"],
+    )
+    return hashes
+
+
+def detect_changes(
+    previous: Optional[pd.DataFrame], current: pd.DataFrame
+) -> TranscriptChanges:
+    """
+    Compare a new scrape with the previous one by (CÓDIGO, PERÍODO) key and row hash.
+
+    Parameters:
+        previous (Optional[pd.DataFrame]): The last synchronized scrape, or None if there is none.
+        current (pd.DataFrame): The new scrape.
+
+    Returns:
+        TranscriptChanges: The inserted, changed and removed rows.
+    """
+    if previous is None or previous.empty:
+        return TranscriptChanges(current, current.iloc[0:0], current.iloc[0:0])
+
+    previous_hashes = _row_hashes(previous)
+    current_hashes = _row_hashes(current)
+    previous_keys = previous_hashes.index
+    current_keys = current_hashes.index
+
+    inserted = ~current_keys.isin(previous_keys)
+    removed = ~previous_keys.isin(current_keys)
+    aligned = previous_hashes.reindex(current_keys)
+    changed = ~inserted & (aligned.to_numpy() != current_hashes.to_numpy())
+
+    changes = TranscriptChanges(
+        inserted=current[inserted],
+        changed=current[changed],
+        removed=previous[removed],
+    )
+    general_log.logger.info(
+        f"Change detection: {len(changes.inserted)} inserted, {len(changes.changed)} changed, "
+        f"{len(changes.removed)} removed rows."
+    )
+    return changes
+
+
+def select_changed_rows(df: pd.DataFrame, changes: TranscriptChanges) -> pd.DataFrame:
+    """
+    Select every current row of the codes affected by the changes.
+
+    The Notion updaters pair the rows of a code with its pages by priority, so all the
+    attempts of an affected code are kept together.
+
+    Parameters:
+        df (pd.DataFrame): The current scrape.
+        changes (TranscriptChanges): The detected changes.
+
+    Returns:
+        pd.DataFrame: The rows to synchronize.
+    """
+    return df[df["CÓDIGO"].astype(str).isin(changes.codes)]
+
+
+def select_removed_codes(df: pd.DataFrame, changes: TranscriptChanges) -> set[str]:
+    """
+    Select the codes whose every row disappeared from the transcript.
+
+    They have no current row to send, so their Notion pages are only matched and reported
+    as orphans.
+
+    Parameters:
+        df (pd.DataFrame): The current scrape.
+        changes (TranscriptChanges): The detected changes.
+
+    Returns:
+        set[str]: The removed codes.
+    """
+    removed = set(changes.removed["CÓDIGO"].dropna().astype(str))
+    return removed - set(df["CÓDIGO"].dropna().astype(str))
@@ -0,0 +1,193 @@
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from config import config
+from logs import general_log
+from transcript_schema import add_categories
+
+DEFAULT_COURSE_EQUIVALENCES = {
+    "FIS122": ["FISD34", "FISD41"],
+    "FIS123": ["FISD37", "FISD40"],
+    "FIS121": ["FISD36", "FISD42"],
+}
+
+
+class CourseEquivalenceEngine:
+    """
+    A class to grade target courses from the CH-weighted average of their equivalent courses.
+
+    Every target row with the pending result (RES = 'DI') receives the weighted NOTA,
+    the total CH of its sources and 'AP' or 'RR' depending on the passing grade.
+    """
+
+    def __init__(
+        self,
+        mappings: Optional[Dict[str, List[str]]] = None,
+        student_column: str = "CPF",
+        pending_result: str = "DI",
+        passing_grade: float = 5,
+    ):
+        """
+        Initialize the CourseEquivalenceEngine with the target to source course mappings.
+
+        Parameters:
+            mappings (Optional[Dict[str, List[str]]]): Source codes of each target code.
+                Defaults to `course_equivalences` in the config.
+            student_column (str): The column identifying the student in multi-student frames.
+            pending_result (str): The RES value of target rows that must be graded.
+            passing_grade (float): The minimum weighted NOTA for an 'AP' result.
+        """
+        mappings = (
+            mappings
+            or config.get("course_equivalences")
+            or DEFAULT_COURSE_EQUIVALENCES
+        )
+        self.student_column = student_column
+        self.pending_result = pending_result
+        self.passing_grade = passing_grade
+        self.targets = list(mappings)
+        self.stages = self._build_stages(mappings)
+
+    @staticmethod
+    def _build_stages(mappings: Dict[str, List[str]]) -> List[pd.DataFrame]:
+        """
+        Split the target to source pairs into stages that can each be graded in one pass.
+
+        Mappings are applied in order, so a target whose sources include an earlier target
+        is graded in a later stage, after that target was written, while a target used as a
+        source by an earlier one is not graded before it. Duplicate sources count once.
+
+        Parameters:
+            mappings (Dict[str, List[str]]): Source codes of each target code.
+
+        Returns:
+            List[pd.DataFrame]: The TARGET and CÓDIGO pairs of every stage, in order.
+        """
+        stage_of: Dict[str, int] = {}
+        for target, sources in mappings.items():
+            stage = 0
+            for earlier, earlier_stage in stage_of.items():
+                if earlier in sources:
+                    stage = max(stage, earlier_stage + 1)
+                if target in mappings[earlier]:
+                    stage = max(stage, earlier_stage)
+            stage_of[target] = stage
+        pairs = pd.DataFrame(
+            [
+                (target, source, stage_of[target])
+                for target, sources in mappings.items()
+                for source in dict.fromkeys(sources)
+            ],
+            columns=["TARGET", "CÓDIGO", "STAGE"],
+        )
+        return [
+            stage_pairs.drop(columns="STAGE")
+            for _, stage_pairs in pairs.groupby("STAGE", sort=True)
+        ]
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute every target's weighted grade in one grouped pass per stage and write it back.
+
+        Parameters:
+            df (pd.DataFrame): The DataFrame containing course data.
+
+        Returns:
+            pd.DataFrame: Updated DataFrame with the calculated grades of the target courses.
+        """
+        if df.empty or not self.stages:
+            return df
+        keys = [self.student_column] if self.student_column in df.columns else []
+        graded = set()
+        for pairs in self.stages:
+            grades = self._aggregate_sources(df, keys, pairs)
+            graded.update(grades.index.get_level_values("TARGET"))
+            self._write_grades(df, keys, grades)
+        self._warn_missing_targets(graded)
+        return df
+
+    def _write_grades(
+        self, df: pd.DataFrame, keys: List[str], grades: pd.DataFrame
+    ) -> None:
+        """
+        Write the aggregated grades to the pending target rows.
+
+        Parameters:
+            df (pd.DataFrame): The DataFrame containing course data, modified in place.
+            keys (List[str]): The student key columns, empty for single-student frames.
+            grades (pd.DataFrame): NOTA, CH and RES indexed by the student keys and the target.
+        """
+        target_mask = df["CÓDIGO"].isin(grades.index.get_level_values("TARGET")) & (
+            df["RES"] == self.pending_result
+        )
+        if not target_mask.any():
+            return
+
+        targets = df.loc[target_mask, keys + ["CÓDIGO"]]
+        if keys:
+            target_index = pd.MultiIndex.from_frame(targets, names=keys + ["TARGET"])
+        else:
+            target_index = pd.Index(targets["CÓDIGO"], name="TARGET")
+        updates = grades.reindex(target_index)
+        updates.index = targets.index
+        updates = updates.dropna(subset=["NOTA"])
+        add_categories(df, "RES", updates["RES"])
+        columns = ["NOTA", "CH", "RES"]
+        df.loc[updates.index, columns] = updates[columns].astype(df[columns].dtypes)
+
+        for index, row in updates.iterrows():
+            general_log.logger.info(
+                f"Updated {targets.at[index, 'CÓDIGO']} with weighted average Nota: {row['NOTA']} "
+                f"and result: {row['RES']}"
+            )
+
+    def _aggregate_sources(
+        self, df: pd.DataFrame, keys: List[str], pairs: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Compute the weighted NOTA, total CH and result of every target with graded sources.
+
+        Parameters:
+            df (pd.DataFrame): The DataFrame containing course data.
+            keys (List[str]): The student key columns, empty for single-student frames.
+            pairs (pd.DataFrame): The TARGET and CÓDIGO pairs of the stage.
+
+        Returns:
+            pd.DataFrame: NOTA, CH and RES indexed by the student keys and the target code.
+        """
+        sources = df[keys + ["CÓDIGO", "CH", "NOTA"]].merge(pairs, on="CÓDIGO")
+        ch = pd.to_numeric(sources["CH"], errors="coerce").astype("float64")
+        nota = pd.to_numeric(sources["NOTA"], errors="coerce").astype("float64")
+        sources = sources.assign(CH=ch, NOTA=nota, WEIGHTED=ch * nota)
+
+        grouped = sources.groupby(keys + ["TARGET"], sort=False, observed=True).agg(
+            CH=("CH", "sum"), WEIGHTED=("WEIGHTED", "sum"), GRADED=("NOTA", "count")
+        )
+        grouped = grouped[grouped["GRADED"] > 0]
+        total_ch = grouped["CH"].to_numpy()
+        weighted = grouped["WEIGHTED"].to_numpy()
+        average = np.divide(
+            weighted, total_ch, out=np.zeros_like(weighted), where=total_ch != 0
+        )
+        return pd.DataFrame(
+            {
+                "NOTA": average,
+                "CH": total_ch,
+                "RES": np.where(average >= self.passing_grade, "AP", "RR"),
+            },
+            index=grouped.index,
+        )
+
+    def _warn_missing_targets(self, graded: Set[str]) -> None:
+        """
+        Log the targets for which no source course has a grade.
+
+        Parameters:
+            graded (Set[str]): The targets graded by at least one stage.
+        """
+        if missing := sorted(set(self.targets) - graded):
+            general_log.logger.warning(
+                f"No graded source courses found for targets: {missing}"
+            )
@@ -0,0 +1,302 @@
+import atexit
+import functools
+import os
+import queue
+import sys
+import threading
+from typing import Any, Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import config
+from logs import general_log
+
+RESET_STORAGE_SCRIPT = "window.localStorage.clear(); window.sessionStorage.clear();"
+_resolve_lock = threading.Lock()
+_driver_path: Optional[str] = None
+
+
+def resolve_driver_path(stale_path: Optional[str] = None) -> str:
+    """
+    Resolve the ChromeDriver binary once per process.
+
+    The `webdriver.driver_path` config key is used when it points to an existing file;
+    otherwise the driver is installed through ChromeDriverManager. The result is kept in
+    memory only, so the config file is never rewritten and a Chrome update is picked up by
+    the next run.
+
+    Parameters:
+        stale_path (Optional[str]): A path that failed to start a browser. If it is still the
+            resolved one, the driver is reinstalled through ChromeDriverManager.
+
+    Returns:
+        str: The absolute path to the ChromeDriver binary.
+    """
+    global _driver_path
+    with _resolve_lock:
+        if _driver_path is None:
+            _driver_path = _configured_driver_path() or _install_driver()
+        elif stale_path is not None and stale_path == _driver_path:
+            _driver_path = _install_driver()
+        return _driver_path
+
+
+def _configured_driver_path() -> Optional[str]:
+    """
+    Return the ChromeDriver binary set in `webdriver.driver_path`, if it exists.
+
+    Returns:
+        Optional[str]: The absolute path to the binary, or None.
+    """
+    driver_path = config.get("webdriver", {}).get("driver_path")
+    if not driver_path:
+        return None
+    if getattr(sys, "frozen", False):
+        project_root = os.path.dirname(sys.executable)
+    else:
+        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    absolute_path = os.path.join(project_root, driver_path)
+    if not os.path.isfile(absolute_path):
+        return None
+    general_log.logger.info(f"Using configured ChromeDriver at {absolute_path}.")
+    return absolute_path
+
+
+def _install_driver() -> str:
+    """
+    Install the ChromeDriver matching the local Chrome through ChromeDriverManager.
+
+    Returns:
+        str: The absolute path to the ChromeDriver binary.
+    """
+    installed_path = ChromeDriverManager().install()
+    general_log.logger.info(f"ChromeDriver installed at {installed_path}.")
+    return installed_path
+
+
+def configure_browser_options() -> Options:
+    """
+    Configure and return the Chrome browser options.
+
+    Returns:
+        Options: Configured Chrome browser options.
+    """
+    options = Options()
+    if config.get("webdriver", {}).get("headless", False):
+        options.add_argument("--headless")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_argument(
+            "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36"
+        )
+
+    return options
+
+
+def launch_driver() -> webdriver.Chrome:
+    """
+    Launch a new Chrome using the cached driver binary.
+
+    If the driver fails to start, typically because Chrome updated itself and no longer
+    matches it, the driver is reinstalled once and the launch retried.
+
+    Returns:
+        webdriver.Chrome: The launched WebDriver.
+    """
+    driver_path = resolve_driver_path()
+    try:
+        return webdriver.Chrome(
+            service=Service(driver_path), options=configure_browser_options()
+        )
+    except WebDriverException as e:
+        general_log.logger.warning(
+            f"ChromeDriver at {driver_path} failed to start, reinstalling it: {e}"
+        )
+    return webdriver.Chrome(
+        service=Service(resolve_driver_path(stale_path=driver_path)),
+        options=configure_browser_options(),
+    )
+
+
+class PooledDriver:
+    """
+    A WebDriver proxy whose `quit` hands the browser back to its pool instead of closing it.
+    """
+
+    def __init__(self, driver: webdriver.Chrome, pool: "DriverPool"):
+        """
+        Initialize the PooledDriver with the wrapped WebDriver and its owner pool.
+
+        Parameters:
+            driver (webdriver.Chrome): The wrapped WebDriver.
+            pool (DriverPool): The pool the driver is returned to.
+        """
+        self._driver = driver
+        self._pool = pool
+        self._released = False
+
+    def __getattr__(self, name: str) -> Any:
+        if self.__dict__.get("_released", True):
+            raise RuntimeError(
+                f"Cannot access '{name}': the WebDriver was returned to the pool."
+            )
+        return getattr(self._driver, name)
+
+    def quit(self) -> None:
+        """
+        Return the browser to the pool. Releasing twice has no effect, but any other use
+        of the proxy afterwards raises a RuntimeError.
+        """
+        if not self._released:
+            self._released = True
+            self._pool.release(self._driver)
+
+
+class DriverPool:
+    """
+    A pool of pre-launched Chrome browsers that are reset between uses instead of quit.
+    """
+
+    def __init__(self, size: int = 1):
+        """
+        Initialize the DriverPool and start launching its browsers in the background.
+
+        Parameters:
+            size (int): The number of browsers kept warm.
+        """
+        self.size = size
+        self._idle: queue.Queue = queue.Queue()
+        self._drivers: list[webdriver.Chrome] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(size):
+            threading.Thread(target=self._add_driver, daemon=True).start()
+
+    def grow(self, size: int) -> None:
+        """
+        Launch more browsers in the background until the pool holds at least `size`.
+
+        Parameters:
+            size (int): The number of browsers the pool should keep warm.
+        """
+        with self._lock:
+            missing = size - self.size
+            if missing <= 0 or self._closed:
+                return
+            self.size = size
+        general_log.logger.info(f"Growing the WebDriver pool to {size} browsers.")
+        for _ in range(missing):
+            threading.Thread(target=self._add_driver, daemon=True).start()
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledDriver:
+        """
+        Take a warm browser from the pool, waiting until one is available.
+
+        Parameters:
+            timeout (Optional[float]): The maximum number of seconds to wait. Waits forever if None.
+
+        Returns:
+            PooledDriver: The browser, returned to the pool by its `quit` method.
+
+        Raises:
+            TimeoutError: If no browser became available in time.
+        """
+        try:
+            driver = self._idle.get(timeout=timeout)
+        except queue.Empty as e:
+            raise TimeoutError("No WebDriver available in the pool.") from e
+        if isinstance(driver, Exception):
+            threading.Thread(target=self._add_driver, daemon=True).start()
+            raise RuntimeError(f"WebDriver failed to start: {driver}") from driver
+        return PooledDriver(driver, self)
+
+    def release(self, driver: webdriver.Chrome) -> None:
+        """
+        Reset the browser and put it back in the pool, replacing it if the reset fails.
+
+        Parameters:
+            driver (webdriver.Chrome): The browser to return.
+        """
+        if self._closed:
+            self._quit(driver)
+            return
+        try:
+            driver.execute_script(RESET_STORAGE_SCRIPT)
+        except Exception as e:
+            general_log.logger.info(f"Storage not cleared for the current page: {e}")
+        try:
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            self._idle.put(driver)
+        except Exception as e:
+            general_log.logger.warning(f"Failed to reset WebDriver, replacing it: {e}")
+            self._quit(driver)
+            threading.Thread(target=self._add_driver, daemon=True).start()
+
+    def close(self) -> None:
+        """
+        Quit every browser owned by the pool.
+        """
+        self._closed = True
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                general_log.logger.warning(f"Failed to quit WebDriver: {e}")
+
+    def _add_driver(self) -> None:
+        """
+        Launch a browser and make it available, or hand the launch error to the next `acquire`.
+        """
+        try:
+            driver = launch_driver()
+        except Exception as e:
+            general_log.logger.error(f"Failed to launch WebDriver: {e}")
+            self._idle.put(e)
+            return
+        with self._lock:
+            if self._closed:
+                driver.quit()
+                return
+            self._drivers.append(driver)
+        self._idle.put(driver)
+        general_log.logger.info("WebDriver launched and added to the pool.")
+
+    def _quit(self, driver: webdriver.Chrome) -> None:
+        """
+        Quit a browser and forget it.
+
+        Parameters:
+            driver (webdriver.Chrome): The browser to quit.
+        """
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception as e:
+            general_log.logger.warning(f"Failed to quit WebDriver: {e}")
+
+
+@functools.lru_cache(maxsize=None)
+def get_driver_pool() -> DriverPool:
+    """
+    Return the process-wide driver pool, creating and warming it on first use.
+
+    Returns:
+        DriverPool: The shared pool sized by `webdriver.pool_size` in the config.
+    """
+    pool = DriverPool(config.get("webdriver", {}).get("pool_size", 1))
+    atexit.register(pool.close)
+    return pool
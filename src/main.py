@@ -1,17 +1,35 @@
+import asyncio
 import os
 import sys
 import threading
-from typing import Union
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import AbstractSet, Any, Dict, Iterable, Iterator, Optional
 
 import pandas as pd
 
 sys.path.append("../../")
 os.chdir(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from change_detection import (
+    detect_changes,
+    select_changed_rows,
+    select_removed_codes,
+)
+from driver_pool import get_driver_pool
 from main_window import MainWindow
-from notion_update import update_notion
+from notion_targets import NotionTarget, load_notion_targets
+from notion_update import update_notion, update_notion_async
+from page_index import NotionPageIndex
 from scraper import Scraper
-from services.notion_api import NotionRequestFactory
+from services.notion_api import (
+    TITLE_PROPERTY_ID,
+    AsyncNotionRequestFactory,
+    NotionRequestFactory,
+    build_code_filters,
+)
+from services.page_state import TRACKED_PROPERTIES
+from snapshot_store import SnapshotStore
 from loading_window import LoadingWindow
 from logs import general_log, return_log
 from config import config
@@ -25,6 +43,8 @@ def initialize_application() -> Scraper:
         Scraper: An instance of the Scraper class with an initialized WebDriver.
     """
     general_log.logger.info("Starting the SIAC Scraping application.")
+    if config.get("scraper", {}).get("backend", "selenium") == "selenium":
+        get_driver_pool()
     login_window = MainWindow(notion_factories)
     login_window.run()
     driver = login_window.get_driver()
@@ -32,7 +52,7 @@ def initialize_application() -> Scraper:
         general_log.logger.error("Failed to initialize the WebDriver.")
         raise RuntimeError("WebDriver initialization failed.")
     general_log.logger.info("WebDriver initialized successfully.")
-    scraper = Scraper(driver)
+    scraper = Scraper(driver, login_window.cpf)
     general_log.logger.info("Scraper instance created successfully.")
 
     return scraper
@@ -52,8 +72,8 @@ def execute_scraping(scraper: Scraper):
     try:
         df = scraper.scrape_table()
         if not df.empty:
-            return_log.logger.info(
-                f"DataFrame obtained from scraping: {df.to_string()}"
+            return_log.payload(
+                lambda: f"DataFrame obtained from scraping: {df.to_string()}"
             )
             return df
         else:
@@ -63,34 +83,137 @@ def execute_scraping(scraper: Scraper):
         raise
 
 
-def get_page_id_from_code(df, notion_factory: NotionRequestFactory) -> dict:
+def save_snapshot(
+    df: pd.DataFrame, student_id: str, store: SnapshotStore
+) -> Optional[Dict[str, Any]]:
+    """
+    Persist the scraped DataFrame in the snapshot store and compact older snapshots.
+
+    A failure is logged without interrupting the synchronization.
+
+    Parameters:
+        df (pd.DataFrame): The scraped DataFrame.
+        student_id (str): Identifies the student.
+        store (SnapshotStore): The snapshot store.
+
+    Returns:
+        Optional[Dict[str, Any]]: The index entry of the snapshot, or None if saving failed.
+    """
+    try:
+        entry = store.save(df, student_id)
+        store.compact()
+        return entry
+    except Exception as e:
+        general_log.logger.error(f"Failed to save snapshot: {e}")
+        return None
+
+
+def select_rows_to_sync(
+    df: pd.DataFrame, student_id: str, store: SnapshotStore
+) -> tuple[pd.DataFrame, set[str]]:
+    """
+    Select the rows that changed since the last snapshot synchronized to Notion.
+
+    Every row is selected when incremental sync is disabled in the config, when there is
+    no synchronized snapshot yet or when the previous snapshot cannot be read.
+
+    Parameters:
+        df (pd.DataFrame): The scraped DataFrame.
+        student_id (str): Identifies the student.
+        store (SnapshotStore): The snapshot store.
+
+    Returns:
+        tuple[pd.DataFrame, set[str]]: The rows to send to Notion, and the codes that
+            disappeared from the transcript since the last sync.
+    """
+    if not config.get("sync", {}).get("incremental", True):
+        return df, set()
+    try:
+        previous = store.load_latest(student_id, synced_only=True)
+    except Exception as e:
+        general_log.logger.error(f"Failed to load the previous snapshot: {e}")
+        return df, set()
+    if previous is None:
+        general_log.logger.info("No synchronized snapshot found, syncing every row.")
+        return df, set()
+    changes = detect_changes(previous, df)
+    return select_changed_rows(df, changes), select_removed_codes(df, changes)
+
+
+def build_code_index(df: pd.DataFrame) -> set[str]:
+    """
+    Build the set of scraped codes used to match Notion pages.
+
+    Parameters:
+        df (DataFrame): The DataFrame containing the 'CÓDIGO' column.
+
+    Returns:
+        set[str]: The distinct scraped codes.
+    """
+    return set(df["CÓDIGO"].dropna().astype(str).unique())
+
+
+def iter_page_codes(pages: Iterable[dict]) -> Iterator[tuple[str, str]]:
+    """
+    Project Notion pages to (code, page_id) tuples, skipping pages without a code.
+
+    Parameters:
+        pages (Iterable[dict]): The Notion pages.
+
+    Yields:
+        tuple[str, str]: The code in the page title and the page ID.
+    """
+    for page in pages:
+        title = page["properties"]["CÓDIGO"]["title"]
+        if title:
+            yield title[0]["text"]["content"], page["id"]
+
+
+def get_page_id_from_code(
+    df,
+    notion_factory: NotionRequestFactory,
+    code_index: Optional[set[str]] = None,
+) -> dict:
     """
     Given a DataFrame with 'CÓDIGO' column, search for the corresponding page in Notion.
 
     Parameters:
         df (DataFrame): The DataFrame containing the 'CÓDIGO' column.
         notion_factory (NotionRequestFactory): An instance of the NotionRequestFactory.
+        code_index (Optional[set[str]]): The scraped codes. Built from `df` if None.
 
     Returns:
         dict: A dictionary mapping each code from the DataFrame to its corresponding page IDs in Notion.
     """
     general_log.logger.info("Fetching pages from Notion to match codes.")
+    if code_index is None:
+        code_index = build_code_index(df)
     page_code_map = {}
     try:
-        pages = notion_factory.get_pages()
-        for page in pages:
-            props = page["properties"]
-            if props["CÓDIGO"]["title"]:
-                notion_code = props["CÓDIGO"]["title"][0]["text"]["content"]
-                matching_row = df[df["CÓDIGO"] == notion_code]
-            else:
-                notion_code = []
-                matching_row = pd.DataFrame()
-            if not matching_row.empty:
-                if notion_code not in page_code_map:
-                    page_code_map[notion_code] = []
-                page_id = page["id"]
-                page_code_map[notion_code].append(page_id)
+        if config.get("notion_index", {}).get("enabled", False):
+            page_index = NotionPageIndex()
+            page_index.refresh(notion_factory)
+            for page_id, values in page_index.load_page_values(
+                notion_factory.database_id
+            ).items():
+                notion_factory.page_state.remember(page_id, values)
+            page_codes = page_index.iter_page_codes(notion_factory.database_id)
+        else:
+            filter_properties = [TITLE_PROPERTY_ID] + notion_factory.get_property_ids(
+                TRACKED_PROPERTIES
+            )
+            page_codes = iter_page_codes(
+                notion_factory.page_state.track(
+                    page
+                    for code_filter in build_code_filters(sorted(code_index))
+                    for page in notion_factory.iter_pages(
+                        filter=code_filter, filter_properties=filter_properties
+                    )
+                )
+            )
+        for notion_code, page_id in page_codes:
+            if notion_code in code_index:
+                page_code_map.setdefault(notion_code, []).append(page_id)
                 general_log.logger.info(
                     f"Matched Notion page with code: {notion_code}, page_id: {page_id}"
                 )
@@ -103,52 +226,92 @@ def get_page_id_from_code(df, notion_factory: NotionRequestFactory) -> dict:
 
 def create_notion_factories() -> dict[str, NotionRequestFactory]:
     """
-    Creates and returns NotionRequestFactory instances for different Notion databases.
+    Creates and returns NotionRequestFactory instances for the Notion databases of every target.
 
     Returns:
-        dict[str, NotionRequestFactory]: A dictionary with NotionRequestFactory instances for each database type.
+        dict[str, NotionRequestFactory]: A dictionary with NotionRequestFactory instances for each target.
     """
-    return {
-        "main": NotionRequestFactory(config, config["notion_login"]["main_db_id"]),
-        "rr": NotionRequestFactory(config, config["notion_login"]["rr_db_id"], "rr"),
-    }
+    return {target.name: target.notion_factory for target in load_notion_targets()}
 
 
-def generate_page_code_maps(
-    df: pd.DataFrame, notion_factories: dict[str, NotionRequestFactory]
-) -> dict[str, dict[str, Union[str, list[str]]]]:
+def sync_notion_table(
+    df: pd.DataFrame, target: NotionTarget, removed_codes: AbstractSet[str] = frozenset()
+):
     """
-    Generates page code maps for each Notion database based on the DataFrame.
+    Run the pipeline of one Notion target: match its pages to the scraped codes and update them.
 
     Parameters:
         df (pd.DataFrame): The DataFrame containing the data.
-        notion_factories (dict[str, NotionRequestFactory]): A dictionary with NotionRequestFactory instances.
+        target (NotionTarget): The target database.
+        removed_codes (AbstractSet[str]): Codes that disappeared from the transcript. Their
+            pages are matched too and reported as orphans.
 
-    Returns:
-        dict[str, dict[str, Union[str, list[str]]]]: A dictionary with page code maps for each Notion database.
+    Raises:
+        RuntimeError: If any operation of the target failed or was not sent.
     """
-    return {
-        "main": get_page_id_from_code(df, notion_factories["main"]),
-        "rr": get_page_id_from_code(df, notion_factories["rr"]),
-    }
+    start = time.perf_counter()
+    rows = target.select_rows(df)
+    notion_factory = target.notion_factory
+    page_code_map = get_page_id_from_code(
+        rows, notion_factory, build_code_index(rows) | removed_codes
+    )
+    general_log.logger.info(
+        f"Notion pipeline '{target.name}': matched {len(page_code_map)} codes "
+        f"for {len(rows)} rows in {time.perf_counter() - start:.1f}s."
+    )
+    if config.get("notion", {}).get("async_updates", False):
+        failed = asyncio.run(
+            update_notion_async(
+                rows,
+                page_code_map,
+                AsyncNotionRequestFactory(notion_factory, target.max_in_flight),
+                target.mapper,
+            )
+        )
+    else:
+        failed = update_notion(
+            rows, page_code_map, notion_factory, target.mapper, target.max_in_flight
+        )
+    if failed:
+        raise RuntimeError(f"{len(failed)} Notion operations failed or were not sent.")
+    general_log.logger.info(
+        f"Notion pipeline '{target.name}' finished in {time.perf_counter() - start:.1f}s."
+    )
 
 
 def update_all_notion_tables(
     df: pd.DataFrame,
-    page_code_maps: dict[str, dict[str, Union[str, list[str]]]],
-    notion_factories: dict[str, NotionRequestFactory],
-):
+    targets: list[NotionTarget],
+    removed_codes: AbstractSet[str] = frozenset(),
+) -> dict[str, str]:
     """
-    Updates all Notion tables with data from the DataFrame.
+    Updates all Notion targets with data from the DataFrame, running their pipelines concurrently.
+
+    The targets share one rate limited connection pool per token. A pipeline that raises or
+    leaves any operation unsent is logged and reported without interrupting the others.
 
     Parameters:
         df (pd.DataFrame): The DataFrame containing the data.
-        page_code_maps (dict[str, dict[str, Union[str, list[str]]]]): A dictionary with page code maps for each Notion database.
-        notion_factories (dict[str, NotionRequestFactory]): A dictionary with NotionRequestFactory instances.
+        targets (list[NotionTarget]): The target databases.
+        removed_codes (AbstractSet[str]): Codes that disappeared from the transcript.
+
+    Returns:
+        dict[str, str]: The error message of every pipeline that failed, keyed by target name.
     """
-    for table_type, page_code_map in page_code_maps.items():
-        if notion_factory := notion_factories[table_type]:
-            update_notion(df, page_code_map, notion_factory, table_type)
+    failures = {}
+    with ThreadPoolExecutor(max_workers=max(len(targets), 1)) as executor:
+        futures = {
+            executor.submit(sync_notion_table, df, target, removed_codes): target.name
+            for target in targets
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                failures[name] = str(e)
+                general_log.logger.error(f"Notion pipeline '{name}' failed: {e}")
+    return failures
 
 
 def run_main_logic(scraper):
@@ -157,20 +320,49 @@ def run_main_logic(scraper):
     This function is executed in a separate thread.
     """
     try:
-        notion_factories = create_notion_factories()
-        for type, factory in notion_factories.items():
-            token = factory.notion_adapter.token
-            db_id = factory.database_id
+        targets = load_notion_targets()
+        for target in targets:
+            token = target.notion_factory.notion_adapter.token
+            db_id = target.notion_factory.database_id
             return_log.logger.info(
-                f"Notion Factory updated: Type='{type}', Token='{token}', DB ID='{db_id}'"
+                f"Notion Factory updated: Type='{target.name}', Token='{token}', DB ID='{db_id}'"
             )
         data_frame = execute_scraping(scraper)
         if data_frame.empty:
             general_log.logger.warning("No data was scraped. Exiting the application.")
             return
 
-        page_code_maps = generate_page_code_maps(data_frame, notion_factories)
-        update_all_notion_tables(data_frame, page_code_maps, notion_factories)
+        store = SnapshotStore()
+        student_id = scraper.student_id or "default"
+        sync_frame, removed_codes = select_rows_to_sync(data_frame, student_id, store)
+        snapshot = save_snapshot(data_frame, student_id, store)
+        failures = {}
+        if sync_frame.empty and not removed_codes:
+            general_log.logger.info("No changes since the last sync, skipping Notion.")
+        else:
+            general_log.logger.info(
+                f"Syncing {len(sync_frame)} of {len(data_frame)} rows and "
+                f"{len(removed_codes)} removed codes to Notion."
+            )
+            failures = update_all_notion_tables(sync_frame, targets, removed_codes)
+            for target in targets:
+                factory = target.notion_factory
+                general_log.logger.info(
+                    f"Notion rate limiter metrics ({target.name}): "
+                    f"{factory.notion_adapter.rate_limiter.metrics()}"
+                )
+                general_log.logger.info(
+                    f"Skipped {factory.page_state.skipped} unchanged page updates ({target.name})."
+                )
+        # A failed target keeps its journal, so the next run skips the operations already
+        # done, and the snapshot stays unsynced, so its rows are diffed and sent again.
+        for target in targets:
+            if target.name not in failures:
+                target.notion_factory.journal.clear(target.notion_factory.database_id)
+        if failures:
+            raise RuntimeError(f"Notion sync failed for {', '.join(sorted(failures))}.")
+        if snapshot:
+            store.mark_synced(snapshot)
 
         general_log.logger.info(
             "Program completed successfully. All tasks were executed."
@@ -2,16 +2,14 @@ import json
 import os
 import sys
 from tkinter import messagebox
-from typing import Optional
+from typing import Optional, Union
 
 import customtkinter as ctk
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
 
+import siac_login
 from services.notion_api import NotionRequestFactory
+from services.siac_http import SiacHttpSession
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
@@ -46,7 +44,8 @@ class MainWindow(GenericWindow):
             },
         )
         self.notion_factories = notion_factories
-        self.driver: Optional[webdriver.Chrome] = None
+        self.driver: Optional[Union[webdriver.Chrome, SiacHttpSession]] = None
+        self.cpf: Optional[str] = None
         self.remember_login_checkbox = None
         self.remember_password_checkbox = None
         self.checkbox_frame: ctk.CTkFrame = None
@@ -200,7 +199,7 @@ class MainWindow(GenericWindow):
 
     def _perform_login(self, cpf: str, password: str) -> None:
         """
-        Perform login action using Selenium WebDriver.
+        Perform login action using the configured scraping backend.
 
         Parameters:
             cpf (str): CPF of the user.
@@ -209,72 +208,8 @@ class MainWindow(GenericWindow):
         login = self.entries["CPF"].get()
         password = self.entries["Password"].get()
         self._update_config(login, password)
-        service = Service(ChromeDriverManager().install())
-        options = self._configure_browser_options()
-        self.driver = webdriver.Chrome(service=service, options=options)
-        self.driver.get(config["siac"]["login_url"])
-        self._input_credentials(cpf, password)
-        self._submit_login_form()
-        self.driver.implicitly_wait(1)
-        if not self._is_login_successful():
-            self.driver.quit()
-            raise ValueError("Wrong CPF or Password.")
-
-    def _configure_browser_options(self) -> Options:
-        """
-        Configure and return the Chrome browser options.
-
-        Returns:
-            Options: Configured Chrome browser options.
-        """
-        options = Options()
-        if config.get("webdriver", {}).get("headless", False):
-            options.add_argument("--headless")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-gpu")
-            options.add_argument("--disable-extensions")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--disable-blink-features=AutomationControlled")
-            options.add_argument(
-                "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36"
-            )
-
-
-        return options
-
-    def _input_credentials(self, cpf: str, password: str) -> None:
-        """
-        Input credentials into the login form.
-
-        Parameters:
-            cpf (str): CPF of the user.
-            password (str): Password of the user.
-        """
-        self.driver.find_element(By.NAME, "cpf").send_keys(cpf)
-        self.driver.find_element(By.NAME, "senha").send_keys(password)
-
-    def _submit_login_form(self) -> None:
-        """
-        Submit the login form.
-        """
-        self.driver.find_element(
-            By.CSS_SELECTOR, 'input[type="image"][src="imagens/botoes/entrar.jpg"]'
-        ).click()
-
-    def _is_login_successful(self) -> bool:
-        """
-        Check if the login was successful by verifying the presence of an element.
-
-        Returns:
-            bool: True if login is successful, otherwise False.
-        """
-        try:
-            self.driver.find_element(
-                By.XPATH, '//tr[@onclick="changeDisplayS(17,18);"]'
-            )
-            return True
-        except Exception:
-            return False
+        self.driver = siac_login.login(cpf, password)
+        self.cpf = cpf
 
     def _login(self) -> None:
         """
@@ -307,14 +242,19 @@ class MainWindow(GenericWindow):
         """
         Collect login information from input fields.
 
+        The fields are merged into `notion_login`, so the other database IDs referenced by
+        `notion_targets` are kept.
+
         Returns:
             dict: A dictionary containing Notion token and database IDs.
         """
-        config["notion_login"] = {
-            "token": self.entries["Notion Token"].get(),
-            "main_db_id": self.entries["Main Database ID"].get(),
-            "rr_db_id": self.entries["Rejection Database ID"].get(),
-        }
+        config.setdefault("notion_login", {}).update(
+            {
+                "token": self.entries["Notion Token"].get(),
+                "main_db_id": self.entries["Main Database ID"].get(),
+                "rr_db_id": self.entries["Rejection Database ID"].get(),
+            }
+        )
         return config
 
     def _has_empty_fields(self, data: dict[str, str]) -> bool:
@@ -327,14 +267,14 @@ class MainWindow(GenericWindow):
         Returns:
             bool: True if any field is empty, otherwise False.
         """
-        return any(value.strip() == "" for value in data.values())
+        return any(str(value or "").strip() == "" for value in data.values())
 
-    def get_driver(self) -> Optional[webdriver.Chrome]:
+    def get_driver(self) -> Optional[Union[webdriver.Chrome, SiacHttpSession]]:
         """
-        Return the Selenium WebDriver instance.
+        Return the logged in driver, either a Selenium WebDriver or an HTTP session.
 
         Returns:
-            Optional[webdriver.Chrome]: An instance of Selenium WebDriver.
+            Optional[Union[webdriver.Chrome, SiacHttpSession]]: The driver consumed by `Scraper`.
         """
         return self.driver
 
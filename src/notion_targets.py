@@ -0,0 +1,130 @@
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import config
+from logs import general_log
+from services.notion_api import NotionRequestFactory
+
+PAYLOAD_MAPPERS = ("main", "rr")
+NOTION_ID_PATTERN = re.compile(
+    r"[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}"
+)
+DEFAULT_TARGETS = [
+    {"name": "main", "database_id": "main_db_id", "mapper": "main"},
+    {"name": "rr", "database_id": "rr_db_id", "mapper": "rr", "rows": {"RES": ["RR"]}},
+]
+
+
+@dataclass
+class NotionTarget:
+    """
+    A Notion database the transcript is mirrored into.
+
+    Attributes:
+        name (str): Identifies the target in logs and reports.
+        notion_factory (NotionRequestFactory): The factory of the database.
+        rows (Dict[str, List[Any]]): The accepted values of each column; every row is sent if empty.
+        max_in_flight (int): The maximum number of concurrent requests of the target.
+    """
+
+    name: str
+    notion_factory: NotionRequestFactory
+    rows: Dict[str, List[Any]] = field(default_factory=dict)
+    max_in_flight: int = 8
+
+    @property
+    def mapper(self) -> str:
+        """
+        Return how rows are turned into pages ("main" updates matched pages, "rr" creates missing ones).
+
+        Returns:
+            str: The payload mapper.
+        """
+        return self.notion_factory.get_type()
+
+    def select_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Select the rows mirrored into the target.
+
+        Parameters:
+            df (pd.DataFrame): The scraped transcript.
+
+        Returns:
+            pd.DataFrame: The rows matching every column selector.
+        """
+        mask = pd.Series(True, index=df.index)
+        for column, values in self.rows.items():
+            mask &= df[column].astype(object).isin(values)
+        return df[mask]
+
+
+def resolve_database_id(value: str) -> str:
+    """
+    Resolve a target database, given either as a key of `notion_login` or as a literal ID.
+
+    Parameters:
+        value (str): The configured database.
+
+    Returns:
+        str: The Notion database ID.
+
+    Raises:
+        ValueError: If the value is neither a `notion_login` key nor a Notion ID.
+    """
+    notion_login = config.get("notion_login", {})
+    if value in notion_login:
+        return notion_login[value]
+    if NOTION_ID_PATTERN.fullmatch(value):
+        return value
+    raise ValueError(
+        f"Notion database '{value}' is neither a notion_login key nor a Notion database ID."
+    )
+
+
+def load_notion_targets(
+    target_configs: Optional[List[Dict[str, Any]]] = None,
+) -> List[NotionTarget]:
+    """
+    Build the Notion targets declared in the config.
+
+    Parameters:
+        target_configs (Optional[List[Dict[str, Any]]]): The target declarations. Defaults to
+            `notion_targets` in the config, or to the main and rr databases if it is absent.
+
+    Returns:
+        List[NotionTarget]: The targets.
+
+    Raises:
+        ValueError: If a target names an unknown payload mapper.
+    """
+    if target_configs is None:
+        target_configs = config.get("notion_targets") or DEFAULT_TARGETS
+    default_in_flight = config.get("notion", {}).get("max_in_flight", 8)
+    targets = []
+    for target_config in target_configs:
+        mapper = target_config.get("mapper", "main")
+        if mapper not in PAYLOAD_MAPPERS:
+            raise ValueError(
+                f"Unknown payload mapper '{mapper}' for Notion target '{target_config['name']}'."
+            )
+        targets.append(
+            NotionTarget(
+                name=target_config["name"],
+                notion_factory=NotionRequestFactory(
+                    config, resolve_database_id(target_config["database_id"]), mapper
+                ),
+                rows=target_config.get("rows") or {},
+                max_in_flight=target_config.get("max_in_flight", default_in_flight),
+            )
+        )
+    general_log.logger.info(
+        f"Loaded {len(targets)} Notion targets: {', '.join(t.name for t in targets)}."
+    )
+    return targets
@@ -1,9 +1,12 @@
-from typing import Union
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Union
 
 import pandas as pd
 
 from logs import general_log
-from services.notion_api import NotionRequestFactory
+from services.notion_api import AsyncNotionRequestFactory, NotionRequestFactory
+from sync_plan import MAIN_PRIORITY, RR_PRIORITY, PlannedOperation, plan_sync
 from utils.generic_window import running
 
 
@@ -12,7 +15,8 @@ def update_notion(
     page_code_map: dict[str, Union[str, list[str]]],
     notion_factory: NotionRequestFactory,
     table_type: str = "main",
-):
+    max_in_flight: int = 1,
+) -> list[PlannedOperation]:
     """
     Main function to update Notion pages based on the table type.
 
@@ -21,22 +25,51 @@ def update_notion(
         page_code_map (dict): A dictionary mapping codes to Notion page IDs or lists of page IDs.
         notion_factory (NotionRequestFactory): An instance of the NotionRequestFactory.
         table_type (str): The type of table to update ("main", "rr").
+        max_in_flight (int): The maximum number of requests sent at once.
+
+    Returns:
+        list[PlannedOperation]: The operations that failed or were not sent.
     """
     if table_type == "main":
-        update_main_notion(df, page_code_map, notion_factory)
-    elif table_type == "rr":
-        update_rr_notion(df, page_code_map, notion_factory)
-    else:
-        general_log.logger.error(
-            f"Unknown table type: {table_type}. No update performed."
-        )
+        return update_main_notion(df, page_code_map, notion_factory, max_in_flight)
+    if table_type == "rr":
+        return update_rr_notion(df, page_code_map, notion_factory, max_in_flight)
+    general_log.logger.error(f"Unknown table type: {table_type}. No update performed.")
+    return []
+
+
+async def update_notion_async(
+    df: pd.DataFrame,
+    page_code_map: dict[str, Union[str, list[str]]],
+    notion_factory: AsyncNotionRequestFactory,
+    table_type: str = "main",
+) -> list[PlannedOperation]:
+    """
+    Asynchronous counterpart of `update_notion`, sending page requests concurrently.
+
+    Parameters:
+        df (DataFrame): The DataFrame containing the data to update.
+        page_code_map (dict): A dictionary mapping codes to Notion page IDs or lists of page IDs.
+        notion_factory (AsyncNotionRequestFactory): An instance of the AsyncNotionRequestFactory.
+        table_type (str): The type of table to update ("main", "rr").
+
+    Returns:
+        list[PlannedOperation]: The operations that failed or were not sent.
+    """
+    if table_type == "main":
+        return await update_main_notion_async(df, page_code_map, notion_factory)
+    if table_type == "rr":
+        return await update_rr_notion_async(df, page_code_map, notion_factory)
+    general_log.logger.error(f"Unknown table type: {table_type}. No update performed.")
+    return []
 
 
 def update_main_notion(
     df: pd.DataFrame,
     page_code_map: dict[str, Union[str, list[str]]],
     notion_factory: NotionRequestFactory,
-):
+    max_in_flight: int = 1,
+) -> list[PlannedOperation]:
     """
     Updates Notion pages with the corresponding data from the DataFrame.
 
@@ -44,26 +77,47 @@ def update_main_notion(
         df (DataFrame): The DataFrame containing the data to update.
         page_code_map (dict): A dictionary mapping codes to Notion page IDs or lists of page IDs.
         notion_factory (NotionRequestFactory): An instance of the NotionRequestFactory.
+        max_in_flight (int): The maximum number of requests sent at once.
+
+    Returns:
+        list[PlannedOperation]: The operations that failed or were not sent.
     """
     general_log.logger.info("Starting update for main Notion table.")
-    for code, page_ids in page_code_map.items():
-        general_log.logger.info(f"Processing code {code}.")
-        filtered_rows = get_filtered_rows(df, "CÓDIGO", code)
-        if filtered_rows.empty:
-            general_log.logger.info(f"No data found for code {code}, skipping update.")
-            continue
-
-        sorted_rows = sort_rows_by_priority(filtered_rows)
-        page_ids = ensure_page_ids_is_list(page_ids)
-        update_pages_with_rows(sorted_rows, page_ids, code, notion_factory)
+    plan = plan_main_notion(df, page_code_map, notion_factory)
+    failed = execute_plan(plan, notion_factory, max_in_flight)
+    general_log.logger.info("Finished updating main Notion table.")
+    return failed
+
+
+async def update_main_notion_async(
+    df: pd.DataFrame,
+    page_code_map: dict[str, Union[str, list[str]]],
+    notion_factory: AsyncNotionRequestFactory,
+) -> list[PlannedOperation]:
+    """
+    Updates Notion pages concurrently with the corresponding data from the DataFrame.
+
+    Parameters:
+        df (DataFrame): The DataFrame containing the data to update.
+        page_code_map (dict): A dictionary mapping codes to Notion page IDs or lists of page IDs.
+        notion_factory (AsyncNotionRequestFactory): An instance of the AsyncNotionRequestFactory.
+
+    Returns:
+        list[PlannedOperation]: The operations that failed or were not sent.
+    """
+    general_log.logger.info("Starting concurrent update for main Notion table.")
+    plan = plan_main_notion(df, page_code_map, notion_factory)
+    failed = await execute_plan_async(plan, notion_factory)
     general_log.logger.info("Finished updating main Notion table.")
+    return failed
 
 
 def update_rr_notion(
     df: pd.DataFrame,
     page_code_map: dict[str, Union[str, list[str]]],
     notion_factory: NotionRequestFactory,
-):
+    max_in_flight: int = 1,
+) -> list[PlannedOperation]:
     """
     Verifies if all rows with RES = 'RR' are present in the Notion table. Creates or updates pages accordingly.
 
@@ -71,121 +125,308 @@ def update_rr_notion(
         df (DataFrame): The DataFrame containing the data to update.
         page_code_map (dict): A dictionary mapping codes to Notion page IDs or lists of page IDs.
         notion_factory (NotionRequestFactory): An instance of the NotionRequestFactory.
+        max_in_flight (int): The maximum number of requests sent at once.
+
+    Returns:
+        list[PlannedOperation]: The operations that failed or were not sent.
     """
     general_log.logger.info("Starting update for rejection Notion table.")
-    filtered_rows = get_filtered_rows(df, "RES", "RR")
-    rr_rows = sort_rows_by_priority(filtered_rows, ["RR"])
-    general_log.logger.info(
-        f"Filtered and sorted rows. Total rows available: {rr_rows.shape[0]}."
-    )
-    grouped_rr = rr_rows.groupby("CÓDIGO")
-    general_log.logger.info(
-        f"Grouped rows by 'CÓDIGO'. Found {len(grouped_rr)} unique codes."
-    )
+    plan = plan_rr_notion(df, page_code_map, notion_factory)
+    failed = execute_plan(plan, notion_factory, max_in_flight)
+    general_log.logger.info("Finished processing all codes.")
+    return failed
 
-    for code, group in grouped_rr:
-        general_log.logger.info(f"Processing code {code}.")
-        if not running:
-            break
-        for _, row in group.iterrows():
-            data = {
-                "CÓDIGO": {"title": [{"text": {"content": code}}]},
-                "NOTA": {"number": row["NOTA"]},
-                "CH": {"number": row["CH"]},
-            }
-            process_code_page(code, page_code_map, row, notion_factory, data)
+
+async def update_rr_notion_async(
+    df: pd.DataFrame,
+    page_code_map: dict[str, Union[str, list[str]]],
+    notion_factory: AsyncNotionRequestFactory,
+) -> list[PlannedOperation]:
+    """
+    Asynchronous counterpart of `update_rr_notion`.
+
+    Parameters:
+        df (DataFrame): The DataFrame containing the data to update.
+        page_code_map (dict): A dictionary mapping codes to Notion page IDs or lists of page IDs.
+        notion_factory (AsyncNotionRequestFactory): An instance of the AsyncNotionRequestFactory.
+
+    Returns:
+        list[PlannedOperation]: The operations that failed or were not sent.
+    """
+    general_log.logger.info("Starting concurrent update for rejection Notion table.")
+    plan = plan_rr_notion(df, page_code_map, notion_factory)
+    failed = await execute_plan_async(plan, notion_factory)
     general_log.logger.info("Finished processing all codes.")
+    return failed
 
 
-def process_row(
-    row: pd.Series,
-    period_page_id: str,
+def plan_main_notion(
+    df: pd.DataFrame,
     page_code_map: dict[str, Union[str, list[str]]],
-    notion_factory: NotionRequestFactory,
-):
+    notion_factory: Union[NotionRequestFactory, AsyncNotionRequestFactory],
+) -> list[PlannedOperation]:
     """
-    Updates or creates a Notion page for a given row of data. The data includes code, subject, workload, and grade.
+    Plans the updates of the main Notion table: every attempt of a code updates one of its pages.
+
+    Parameters:
+        df (DataFrame): The DataFrame containing the data to update.
+        page_code_map (dict): A dictionary mapping codes to Notion page IDs or lists of page IDs.
+        notion_factory: The factory whose page state holds the current PERÍODO of each page.
 
-    Args:
-        row (pd.Series): Row data containing 'CÓDIGO', 'MATÉRIA', 'CH', and 'NOTA'.
-        period_page_id (str): The ID of the Notion page related to the period.
-        page_code_map (dict[str, Union[str, list[str]]]): Dictionary mapping codes to Notion page IDs or lists of page IDs.
-        notion_factory (NotionRequestFactory): Instance of NotionRequestFactory used to interact with Notion API.
+    Returns:
+        list[PlannedOperation]: The update and orphan operations.
     """
-    code = row["CÓDIGO"]
-    general_log.logger.info(f"Updating/Creating page for code: {code}.")
-    data = build_notion_data(row, period_page_id)
-    process_code_page(code, page_code_map, row, notion_factory, data)
+    plan = plan_sync(
+        df,
+        page_code_map,
+        MAIN_PRIORITY,
+        create_missing=False,
+        page_periods=notion_factory.page_state.get_values("PERÍODO"),
+    )
+    general_log.logger.info(f"Planned {len(plan)} operations for main Notion table.")
+    return plan
 
 
-def build_notion_data(row: pd.Series, period_page_id: str) -> dict:
+def plan_rr_notion(
+    df: pd.DataFrame,
+    page_code_map: dict[str, Union[str, list[str]]],
+    notion_factory: Union[NotionRequestFactory, AsyncNotionRequestFactory],
+) -> list[PlannedOperation]:
     """
-    Constructs the data payload for updating or creating a Notion page based on the provided row data.
+    Plans the rejection Notion table: every 'RR' attempt updates a page of its code or creates one.
 
-    Args:
-        row (pd.Series): Row data containing 'CÓDIGO', 'MATÉRIA', 'CH', and 'NOTA'.
-        period_page_id (str): The ID of the Notion page related to the period.
+    The pages of codes that have no scraped row at all are kept, so they become orphans.
+
+    Parameters:
+        df (DataFrame): The DataFrame containing the data to update.
+        page_code_map (dict): A dictionary mapping codes to Notion page IDs or lists of page IDs.
+        notion_factory: The factory whose page state holds the current PERÍODO of each page.
 
     Returns:
-        dict: The data payload for Notion API requests.
+        list[PlannedOperation]: The update, create and orphan operations.
     """
-    return {
-        "item principal": {"relation": [{"id": period_page_id}]},
-        "CÓDIGO": {"title": [{"text": {"content": row["CÓDIGO"]}}]},
-        "MATÉRIA": {"rich_text": [{"text": {"content": row["MATÉRIA"]}}]},
-        "CH": {"number": row["CH"]},
-        "NOTA": {"number": row["NOTA"]},
-    }
+    rr_rows = get_filtered_rows(df, "RES", "RR")
+    rr_codes = set(rr_rows["CÓDIGO"].astype(str))
+    scraped_codes = set(df["CÓDIGO"].astype(str))
+    plan = plan_sync(
+        rr_rows,
+        {
+            code: pages
+            for code, pages in page_code_map.items()
+            if code in rr_codes or code not in scraped_codes
+        },
+        RR_PRIORITY,
+        create_missing=True,
+        page_periods=notion_factory.page_state.get_values("PERÍODO"),
+    )
+    general_log.logger.info(
+        f"Planned {len(plan)} operations for {len(rr_codes)} codes of the rejection Notion table."
+    )
+    return plan
 
 
-def process_code_page(
-    code: str,
-    page_code_map: dict[str, any],
-    row: dict[str, any],
+def execute_plan(
+    plan: list[PlannedOperation],
     notion_factory: NotionRequestFactory,
-    data: dict[str, any],
-) -> None:
+    max_in_flight: int = 1,
+) -> list[PlannedOperation]:
     """
-    Processes the given code to either update an existing page or create a new one in Notion.
-
-    If the code is found in `page_code_map`, the function updates the corresponding pages.
-    If the code is not found, a new page is created in Notion with the provided `data`.
+    Sends the operations of a sync plan on a bounded pool of threads; they target distinct pages.
 
     Parameters:
-        code (str): The unique code representing the page.
-        page_code_map (dict[str, Any]): A mapping of codes to Notion page IDs.
-        row (dict[str, Any]): A dictionary containing row data with the 'NOTA' field.
-        notion_factory (NotionRequestFactory): An instance of NotionRequestFactory to handle Notion API requests.
-        data (dict[str, Any]): The data to be used when creating a new page in Notion.
+        plan (list[PlannedOperation]): The planned operations.
+        notion_factory (NotionRequestFactory): An instance of the NotionRequestFactory.
+        max_in_flight (int): The maximum number of requests sent at once. With 1, the
+            operations are sent one after the other.
 
     Returns:
-        None
-    """
-    if code in page_code_map:
-        for page_id in ensure_page_ids_is_list(page_code_map[code]):
-            if not running:
-                break
-            log_and_update_page(page_id, row, notion_factory)
-            if page_id in page_code_map[code]:
-                if isinstance(page_code_map[code], list):
-                    page_code_map[code].remove(page_id)
-                else:
-                    page_code_map[code] = []
-            if not page_code_map[code]:
-                del page_code_map[code]
+        list[PlannedOperation]: The operations Notion rejected, and those left unsent because
+            the application is closing.
+    """
+    sent = []
+    for operation in plan:
+        if operation.kind == "orphan":
+            log_orphan_page(operation)
+        else:
+            sent.append(operation)
+    if max_in_flight > 1:
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            results = list(
+                executor.map(lambda op: execute_operation(op, notion_factory), sent)
+            )
     else:
-        general_log.logger.warning(f"No remaining page IDs for code {code}.")
-        general_log.logger.info(
-            f"Creating new page for code {code} with NOTA {row['NOTA']}."
+        results = [execute_operation(operation, notion_factory) for operation in sent]
+    failed = [operation for operation, ok in zip(sent, results) if not ok]
+    log_failed_operations(failed)
+    return failed
+
+
+def execute_operation(
+    operation: PlannedOperation, notion_factory: NotionRequestFactory
+) -> bool:
+    """
+    Sends one update or create operation of a sync plan.
+
+    Parameters:
+        operation (PlannedOperation): The operation.
+        notion_factory (NotionRequestFactory): An instance of the NotionRequestFactory.
+
+    Returns:
+        bool: False if Notion rejected the operation or the application is closing.
+    """
+    if not running:
+        return False
+    if operation.kind == "update":
+        return update_page_with_data(
+            operation.page_id, operation.code, operation.data, notion_factory
         )
+    return log_and_create_page(operation.code, operation.data, notion_factory)
 
-        response = notion_factory.create_page(data)
-        if response.status_code == 200:
-            general_log.logger.info(f"Successfully created new page for code {code}.")
-        else:
-            general_log.logger.error(
-                f"Failed to create page for code {code}. Status code: {response.status_code}"
+
+async def execute_plan_async(
+    plan: list[PlannedOperation], notion_factory: AsyncNotionRequestFactory
+) -> list[PlannedOperation]:
+    """
+    Sends the operations of a sync plan concurrently; they target distinct pages.
+
+    Parameters:
+        plan (list[PlannedOperation]): The planned operations.
+        notion_factory (AsyncNotionRequestFactory): An instance of the AsyncNotionRequestFactory.
+
+    Returns:
+        list[PlannedOperation]: The operations Notion rejected, and those left unsent because
+            the application is closing.
+    """
+    sent, pending = [], []
+    for operation in plan:
+        if operation.kind == "update":
+            sent.append(operation)
+            pending.append(
+                update_page_with_data_async(
+                    operation.page_id, operation.code, operation.data, notion_factory
+                )
             )
+        elif operation.kind == "create":
+            sent.append(operation)
+            pending.append(
+                log_and_create_page_async(operation.code, operation.data, notion_factory)
+            )
+        else:
+            log_orphan_page(operation)
+    results = await asyncio.gather(*pending)
+    failed = [operation for operation, ok in zip(sent, results) if not ok]
+    log_failed_operations(failed)
+    return failed
+
+
+def log_failed_operations(failed: list[PlannedOperation]):
+    """
+    Logs the operations of a sync plan that did not reach Notion.
+
+    Parameters:
+        failed (list[PlannedOperation]): The failed or unsent operations.
+    """
+    if failed:
+        general_log.logger.error(
+            f"{len(failed)} Notion operations failed or were not sent: "
+            f"{', '.join(sorted({operation.code for operation in failed}))}."
+        )
+
+
+def log_orphan_page(operation: PlannedOperation):
+    """
+    Logs a Notion page that no scraped row was assigned to.
+
+    Parameters:
+        operation (PlannedOperation): The orphan operation.
+    """
+    general_log.logger.warning(
+        f"No more data available to update for code {operation.code} (page_id: {operation.page_id}). Skipping."
+    )
+
+
+def log_and_create_page(
+    code: str, data: dict, notion_factory: NotionRequestFactory
+) -> bool:
+    """
+    Logs the creation and creates a Notion page, unless an interrupted sync already did.
+
+    Parameters:
+        code (str): The code of the new page.
+        data (dict): The properties of the new page.
+        notion_factory (NotionRequestFactory): An instance of the NotionRequestFactory.
+
+    Returns:
+        bool: False if Notion rejected the creation.
+    """
+    key = notion_factory.journal.begin("create", notion_factory.database_id, code, data)
+    if key is None:
+        general_log.logger.info(
+            f"Page for code {code} was already created by an interrupted sync."
+        )
+        return True
+    general_log.logger.info(
+        f"Creating new page for code {code} with NOTA {data['NOTA']['number']}."
+    )
+    response = notion_factory.create_page(data)
+    return log_create_response(code, key, response, notion_factory)
+
+
+async def log_and_create_page_async(
+    code: str, data: dict, notion_factory: AsyncNotionRequestFactory
+) -> bool:
+    """
+    Asynchronous counterpart of `log_and_create_page`.
+
+    Parameters:
+        code (str): The code of the new page.
+        data (dict): The properties of the new page.
+        notion_factory (AsyncNotionRequestFactory): An instance of the AsyncNotionRequestFactory.
+
+    Returns:
+        bool: False if Notion rejected the creation or the application is closing.
+    """
+    if not running:
+        return False
+    key = notion_factory.journal.begin("create", notion_factory.database_id, code, data)
+    if key is None:
+        general_log.logger.info(
+            f"Page for code {code} was already created by an interrupted sync."
+        )
+        return True
+    general_log.logger.info(
+        f"Creating new page for code {code} with NOTA {data['NOTA']['number']}."
+    )
+    response = await notion_factory.create_page(data)
+    return log_create_response(code, key, response, notion_factory)
+
+
+def log_create_response(
+    code: str,
+    key: str,
+    response,
+    notion_factory: Union[NotionRequestFactory, AsyncNotionRequestFactory],
+) -> bool:
+    """
+    Logs the outcome of a page creation and marks it done in the journal on success.
+
+    Parameters:
+        code (str): The code of the new page.
+        key (str): The journal key of the creation.
+        response (Response): The response from the Notion API.
+        notion_factory: The factory that sent the request.
+
+    Returns:
+        bool: True if the page was created.
+    """
+    if response.status_code == 200:
+        notion_factory.journal.complete(key)
+        general_log.logger.info(f"Successfully created new page for code {code}.")
+        return True
+    general_log.logger.error(
+        f"Failed to create page for code {code}. Status code: {response.status_code}"
+    )
+    return False
 
 
 def get_filtered_rows(df: pd.DataFrame, column_name: str, code: str) -> pd.DataFrame:
@@ -200,121 +441,141 @@ def get_filtered_rows(df: pd.DataFrame, column_name: str, code: str) -> pd.DataF
     Returns:
         DataFrame: Filtered rows matching the code in the specified column.
     """
-    return df[df[column_name] == code].copy()
+    return df[df[column_name] == code]
+
+
+def log_update_response(page_id: str, code: str, data: dict, response) -> None:
+    """
+    Logs the outcome of a Notion page update.
+
+    Parameters:
+        page_id (str): The updated Notion page ID.
+        code (str): The code of the row sent to the page.
+        data (dict): The properties sent.
+        response (Response): The response from the Notion API.
+    """
+    if response.status_code == 200:
+        general_log.logger.info(
+            f"Successfully updated Notion page with {code} (page_id: {page_id}) with data: {data}."
+        )
+    else:
+        general_log.logger.error(
+            f"Failed to update Notion page with {code} (page_id: {page_id}). Status code: {response.status_code}"
+        )
 
 
-def sort_rows_by_priority(
-    filtered_rows: pd.DataFrame, res_priority: list[str] = None
-) -> pd.DataFrame:
+def begin_update(
+    page_id: str,
+    code: str,
+    data: dict,
+    notion_factory: Union[NotionRequestFactory, AsyncNotionRequestFactory],
+) -> Optional[str]:
     """
-    Sorts the filtered rows by 'RES' priority and 'NOTA'.
+    Decides if a page update must be sent and records it in the journal.
+
+    Empty payloads, payloads the page already holds and updates completed by an interrupted
+    sync are skipped.
 
     Parameters:
-        filtered_rows (DataFrame): The filtered rows to be sorted.
-        res_priority (list): A list defining the priority order for the 'RES' column. Default is ["AP", "DU", "DI", "RR"].
+        page_id (str): The Notion page ID to update.
+        code (str): The code of the row sent to the page.
+        data (dict): The properties to send.
+        notion_factory: The factory that will send the request.
 
     Returns:
-        DataFrame: Sorted rows based on 'RES' priority and 'NOTA'.
-    """
-    if not res_priority:
-        res_priority = ["AP", "DU", "DI", "RR"]
-    res_priority_map = {res: idx for idx, res in enumerate(res_priority)}
-    filtered_rows["RES_PRIORITY"] = filtered_rows["RES"].map(res_priority_map)
-    return filtered_rows.sort_values(
-        by=["RES_PRIORITY", "NOTA"], ascending=[True, False]
+        Optional[str]: The journal key of the update, or None if it is skipped.
+    """
+    if not data:
+        general_log.logger.info(
+            f"No valid data to update for {code} (page_id: {page_id}). Skipping update."
+        )
+        return None
+    if notion_factory.page_state.is_unchanged(page_id, data):
+        general_log.logger.info(
+            f"Notion page {page_id} already holds {code} data. Skipping update."
+        )
+        return None
+    key = notion_factory.journal.begin(
+        "update", notion_factory.database_id, page_id, data
     )
+    if key is None:
+        general_log.logger.info(
+            f"Notion page {page_id} was already updated by an interrupted sync. Skipping update."
+        )
+    return key
 
 
-def ensure_page_ids_is_list(page_ids: Union[str, list[str]]) -> list[str]:
+def finish_update(
+    page_id: str,
+    code: str,
+    data: dict,
+    key: str,
+    response,
+    notion_factory: Union[NotionRequestFactory, AsyncNotionRequestFactory],
+) -> bool:
     """
-    Ensures that page_ids is always a list.
+    Logs the outcome of a page update and records it on success.
 
     Parameters:
-        page_ids: The page ID or list of page IDs.
+        page_id (str): The updated Notion page ID.
+        code (str): The code of the row sent to the page.
+        data (dict): The properties sent.
+        key (str): The journal key of the update.
+        response (Response): The response from the Notion API.
+        notion_factory: The factory that sent the request.
 
     Returns:
-        list: A list of page IDs.
+        bool: True if the page was updated.
     """
-    return page_ids if isinstance(page_ids, list) else [page_ids]
+    log_update_response(page_id, code, data, response)
+    if response.status_code != 200:
+        return False
+    notion_factory.page_state.remember_update(page_id, data)
+    notion_factory.journal.complete(key)
+    return True
 
 
-def update_pages_with_rows(
-    sorted_rows: pd.DataFrame,
-    page_ids: list[str],
-    code: str,
-    notion_factory: NotionRequestFactory,
-):
+def update_page_with_data(
+    page_id: str, code: str, data: dict, notion_factory: NotionRequestFactory
+) -> bool:
     """
-    Updates the Notion pages with the corresponding rows of data from the DataFrame.
+    Sends compiled properties to a Notion page unless the update can be skipped.
 
     Parameters:
-        sorted_rows (DataFrame): The sorted rows to update.
-        page_ids (list): The list of page IDs to update.
-        code (str): The code corresponding to the page and rows.
+        page_id (str): The Notion page ID to update.
+        code (str): The code of the row sent to the page.
+        data (dict): The properties to send.
         notion_factory (NotionRequestFactory): An instance of the NotionRequestFactory.
+
+    Returns:
+        bool: False if Notion rejected the update.
     """
-    for idx, page_id in enumerate(page_ids):
-        if not running:
-            break
-        if idx < len(sorted_rows):
-            row = sorted_rows.iloc[idx]
-            log_and_update_page(page_id, row, notion_factory)
-        else:
-            general_log.logger.warning(
-                f"No more data available to update for code {code} (page_id: {page_id}). Skipping."
-            )
+    key = begin_update(page_id, code, data, notion_factory)
+    if key is None:
+        return True
+    response = notion_factory.update_page(page_id, data)
+    return finish_update(page_id, code, data, key, response, notion_factory)
 
 
-def log_and_update_page(
-    page_id: str, row: pd.Series, notion_factory: NotionRequestFactory
-):
+async def update_page_with_data_async(
+    page_id: str, code: str, data: dict, notion_factory: AsyncNotionRequestFactory
+) -> bool:
     """
-    Logs the update and performs the actual update of the Notion page.
+    Asynchronous counterpart of `update_page_with_data`.
 
     Parameters:
         page_id (str): The Notion page ID to update.
-        row (pd.Series): The row of data to update in the Notion page.
-        notion_factory (NotionRequestFactory): An instance of the NotionRequestFactory.
+        code (str): The code of the row sent to the page.
+        data (dict): The properties to send.
+        notion_factory (AsyncNotionRequestFactory): An instance of the AsyncNotionRequestFactory.
+
+    Returns:
+        bool: False if Notion rejected the update or the application is closing.
     """
-    row_copy = row.copy()
-    fields = {
-        "NOTA": {"key": "number"},
-        "CH": {"key": "number"},
-        "PERÍODO": {
-            "key": "rich_text",
-            "format": lambda x: [{"text": {"content": x}}],
-        },
-    }
-    if row_copy["RES"] == "--":
-        row_copy["NOTA"] = -1
-        fields.pop("CH")
-    general_log.logger.info(
-        f"Updating Notion page (page_id: {page_id}) with {row_copy['CÓDIGO']} using row with "
-        f"RES='{row_copy['RES']}', NOTA={row_copy['NOTA']}, CH={row_copy['CH'] if 'CH' in row_copy else '--'}, "
-        f"PERÍODO='{row_copy['PERÍODO']}'."
-    )
-    data = {
-        field: {
-            config["key"]: (
-                config["format"](row_copy[field])
-                if "format" in config
-                else row_copy[field]
-            )
-        }
-        for field, config in fields.items()
-        if pd.notna(row_copy[field]) and row_copy[field] not in ["", " ", "--", None]
-    }
-    if data:
-        response = notion_factory.update_page(page_id, data)
-        if response.status_code == 200:
-            general_log.logger.info(
-                f"Successfully updated Notion page with {row_copy['CÓDIGO']} (page_id: {page_id}) with data: {data}."
-            )
-        else:
-            general_log.logger.error(
-                f"Failed to update Notion page with {row_copy['CÓDIGO']} (page_id: {page_id}). Status code: {response.status_code}"
-            )
-    else:
-        general_log.logger.info(
-            f"No valid data to update for {row_copy['CÓDIGO']} (page_id: {page_id}). Skipping update."
-        )
+    if not running:
+        return False
+    key = begin_update(page_id, code, data, notion_factory)
+    if key is None:
+        return True
+    response = await notion_factory.update_page(page_id, data)
+    return finish_update(page_id, code, data, key, response, notion_factory)
@@ -0,0 +1,241 @@
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import config
+from logs import general_log
+from services.notion_api import TITLE_PROPERTY_ID, NotionRequestFactory
+from services.page_state import TRACKED_PROPERTIES, extract_page_values
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    database_id TEXT NOT NULL,
+    page_id TEXT NOT NULL,
+    code TEXT,
+    properties_hash TEXT NOT NULL,
+    page_values TEXT NOT NULL,
+    created_time TEXT NOT NULL,
+    last_edited_time TEXT NOT NULL,
+    PRIMARY KEY (database_id, page_id)
+);
+CREATE INDEX IF NOT EXISTS pages_code ON pages (database_id, code);
+CREATE TABLE IF NOT EXISTS sync_state (
+    database_id TEXT PRIMARY KEY,
+    last_refresh TEXT NOT NULL,
+    last_full_refresh TEXT NOT NULL
+);
+"""
+
+
+def get_page_code(page: Dict[str, Any]) -> Optional[str]:
+    """
+    Read the code in the title of a Notion page.
+
+    Parameters:
+        page (Dict[str, Any]): The Notion page.
+
+    Returns:
+        Optional[str]: The code, or None if the title is empty.
+    """
+    title = page["properties"].get("CÓDIGO", {}).get("title")
+    return title[0]["text"]["content"] if title else None
+
+
+def is_removed(page: Dict[str, Any]) -> bool:
+    """
+    Check if a Notion page was archived or moved to the trash.
+
+    Parameters:
+        page (Dict[str, Any]): The Notion page.
+
+    Returns:
+        bool: True if the page no longer belongs to the database.
+    """
+    return bool(page.get("archived") or page.get("in_trash"))
+
+
+def hash_properties(page: Dict[str, Any]) -> str:
+    """
+    Compute a content hash of the properties of a Notion page.
+
+    Parameters:
+        page (Dict[str, Any]): The Notion page.
+
+    Returns:
+        str: The SHA-1 hex digest of the canonical JSON properties.
+    """
+    properties = json.dumps(page["properties"], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(properties.encode("utf-8")).hexdigest()
+
+
+class NotionPageIndex:
+    """
+    A class to keep a local SQLite copy of the code, ID and tracked values of every page of the
+    Notion databases. Only the title and the tracked properties are downloaded.
+
+    After the first full load, a refresh only asks Notion for the pages edited since the
+    previous one, dropping those that come back archived or trashed. Deleted pages are not
+    returned by such queries, so the index is rebuilt from scratch every
+    `notion_index.full_refresh_days`.
+    """
+
+    # Notion rounds last_edited_time down to the minute.
+    EDIT_TIME_MARGIN = timedelta(minutes=2)
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the NotionPageIndex.
+
+        Parameters:
+            path (Optional[str]): The SQLite file. Defaults to `notion_index.path` in the config.
+        """
+        index_config = config.get("notion_index", {})
+        if path is None:
+            if getattr(sys, "frozen", False):
+                base_path = os.path.dirname(sys.executable)
+            else:
+                base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+            path = os.path.join(
+                base_path, index_config.get("path", "data/notion_index.sqlite")
+            )
+        self.path = path
+        self.full_refresh_days = index_config.get("full_refresh_days", 7)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.executescript(SCHEMA)
+
+    def refresh(self, notion_factory: NotionRequestFactory) -> int:
+        """
+        Bring the index of a database up to date with Notion.
+
+        Parameters:
+            notion_factory (NotionRequestFactory): The factory of the database.
+
+        Returns:
+            int: The number of pages fetched from Notion.
+
+        Raises:
+            NotionAPIError: If Notion answers the query with an error. The index is left as it was.
+        """
+        database_id = notion_factory.database_id
+        started_at = datetime.now(timezone.utc)
+        with closing(self._connect()) as connection:
+            state = connection.execute(
+                "SELECT last_refresh, last_full_refresh FROM sync_state WHERE database_id = ?",
+                (database_id,),
+            ).fetchone()
+
+        filter_properties = [TITLE_PROPERTY_ID] + notion_factory.get_property_ids(
+            TRACKED_PROPERTIES
+        )
+        full_refresh = state is None or datetime.fromisoformat(state[1]) < (
+            started_at - timedelta(days=self.full_refresh_days)
+        )
+        if full_refresh:
+            general_log.logger.info(f"Rebuilding the Notion page index of {database_id}.")
+            pages = notion_factory.iter_pages(filter_properties=filter_properties)
+        else:
+            since = datetime.fromisoformat(state[0]) - self.EDIT_TIME_MARGIN
+            general_log.logger.info(
+                f"Refreshing the Notion page index of {database_id} since {since.isoformat()}."
+            )
+            pages = notion_factory.iter_pages(
+                filter={
+                    "timestamp": "last_edited_time",
+                    "last_edited_time": {"on_or_after": since.isoformat()},
+                },
+                filter_properties=filter_properties,
+            )
+
+        # Every page is fetched before the index is touched, so a failed query leaves both
+        # the pages and the sync state of the previous refresh in place.
+        rows, removed = [], []
+        for page in pages:
+            if is_removed(page):
+                removed.append((database_id, page["id"]))
+                continue
+            rows.append(
+                (
+                    database_id,
+                    page["id"],
+                    get_page_code(page),
+                    hash_properties(page),
+                    json.dumps(extract_page_values(page), ensure_ascii=False),
+                    page["created_time"],
+                    page["last_edited_time"],
+                )
+            )
+        with closing(self._connect()) as connection, connection:
+            if full_refresh:
+                connection.execute("DELETE FROM pages WHERE database_id = ?", (database_id,))
+            connection.executemany(
+                "DELETE FROM pages WHERE database_id = ? AND page_id = ?", removed
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+                (
+                    database_id,
+                    started_at.isoformat(),
+                    started_at.isoformat() if full_refresh else state[1],
+                ),
+            )
+        general_log.logger.info(
+            f"Notion page index of {database_id} refreshed with {len(rows)} pages, "
+            f"{len(removed)} removed."
+        )
+        return len(rows) + len(removed)
+
+    def iter_page_codes(self, database_id: str) -> Iterator[tuple[str, str]]:
+        """
+        Yield the (code, page_id) pairs of a database, oldest page first.
+
+        Parameters:
+            database_id (str): The Notion database ID.
+
+        Yields:
+            tuple[str, str]: The code in the page title and the page ID.
+        """
+        with closing(self._connect()) as connection:
+            yield from connection.execute(
+                "SELECT code, page_id FROM pages WHERE database_id = ? AND code IS NOT NULL "
+                "ORDER BY created_time, page_id",
+                (database_id,),
+            )
+
+    def load_page_values(self, database_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Load the tracked property values of every page of a database.
+
+        Parameters:
+            database_id (str): The Notion database ID.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The values of each page, keyed by page ID.
+        """
+        with closing(self._connect()) as connection:
+            return {
+                page_id: json.loads(page_values)
+                for page_id, page_values in connection.execute(
+                    "SELECT page_id, page_values FROM pages WHERE database_id = ?",
+                    (database_id,),
+                )
+            }
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a connection to the index.
+
+        Returns:
+            sqlite3.Connection: The connection.
+        """
+        return sqlite3.connect(self.path, timeout=30)
@@ -0,0 +1,122 @@
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_integer_dtype, is_numeric_dtype
+
+EMPTY_TEXTS = ["", " ", "--"]
+PLACEHOLDER_RESULT = "--"
+PLACEHOLDER_GRADE = -1
+
+PROPERTY_TEMPLATES: Dict[str, Callable[[Any], Dict[str, Any]]] = {
+    "number": lambda value: {"number": value},
+    "rich_text": lambda value: {"rich_text": [{"text": {"content": value}}]},
+    "title": lambda value: {"title": [{"text": {"content": value}}]},
+}
+UPDATE_PROPERTIES = {"NOTA": "number", "CH": "number", "PERÍODO": "rich_text"}
+CREATE_PROPERTIES = {"CÓDIGO": "title", "NOTA": "number", "CH": "number"}
+
+
+def plain_numbers(series: pd.Series) -> np.ndarray:
+    """
+    Convert a numeric column into JSON ready Python numbers, with None for missing values.
+
+    Floats go through their shortest repr, so a float32 7.3 becomes 7.3.
+
+    Parameters:
+        series (pd.Series): The column.
+
+    Returns:
+        np.ndarray: An object array of ints, floats and None.
+    """
+    if not is_numeric_dtype(series.dtype):
+        series = pd.to_numeric(series.astype(object), errors="coerce")
+    missing = series.isna().to_numpy()
+    if is_integer_dtype(series.dtype):
+        values = series.to_numpy(dtype="int64", na_value=0).astype(object)
+    else:
+        dtype = "float32" if series.dtype in ("float32", "Float32") else "float64"
+        floats = series.to_numpy(dtype=dtype, na_value=np.nan)
+        values = floats.astype(str).astype(float).astype(object)
+    values[missing] = None
+    return values
+
+
+def plain_texts(series: pd.Series) -> np.ndarray:
+    """
+    Convert a text column into Python strings, with None for missing or blank values.
+
+    Parameters:
+        series (pd.Series): The column.
+
+    Returns:
+        np.ndarray: An object array of strings and None.
+    """
+    values = series.astype(object).to_numpy(copy=True)
+    empty = series.isna().to_numpy() | series.astype(object).isin(EMPTY_TEXTS).to_numpy()
+    values[empty] = None
+    return values
+
+
+def assemble_payloads(
+    columns: Dict[str, np.ndarray], properties: Dict[str, str], drop_empty: bool
+) -> List[Dict[str, Any]]:
+    """
+    Zip prepared columns into one Notion property dict per row.
+
+    Parameters:
+        columns (Dict[str, np.ndarray]): The plain values of each property.
+        properties (Dict[str, str]): The Notion type of each property.
+        drop_empty (bool): Whether None values are left out of the payload.
+
+    Returns:
+        List[Dict[str, Any]]: The payloads, in row order.
+    """
+    length = len(next(iter(columns.values()))) if columns else 0
+    payloads: List[Dict[str, Any]] = [{} for _ in range(length)]
+    for name, kind in properties.items():
+        template = PROPERTY_TEMPLATES[kind]
+        for payload, value in zip(payloads, columns[name].tolist()):
+            if value is not None or not drop_empty:
+                payload[name] = template(value)
+    return payloads
+
+
+def compile_update_payloads(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Build the properties that update a Notion page from every row of a transcript at once.
+
+    A row whose RES is '--' sends NOTA -1 and no CH. Missing and blank values are dropped,
+    so a row with nothing to send yields an empty dict.
+
+    Parameters:
+        df (pd.DataFrame): The transcript rows.
+
+    Returns:
+        List[Dict[str, Any]]: The payloads, in row order.
+    """
+    placeholder = df["RES"].astype(object).eq(PLACEHOLDER_RESULT).to_numpy()
+    grades = plain_numbers(df["NOTA"])
+    grades[placeholder] = PLACEHOLDER_GRADE
+    workloads = plain_numbers(df["CH"])
+    workloads[placeholder] = None
+    columns = {"NOTA": grades, "CH": workloads, "PERÍODO": plain_texts(df["PERÍODO"])}
+    return assemble_payloads(columns, UPDATE_PROPERTIES, drop_empty=True)
+
+
+def compile_create_payloads(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Build the properties of a new rejection page from every row of a transcript at once.
+
+    Parameters:
+        df (pd.DataFrame): The transcript rows.
+
+    Returns:
+        List[Dict[str, Any]]: The payloads, in row order.
+    """
+    columns = {
+        "CÓDIGO": df["CÓDIGO"].astype(str).to_numpy(dtype=object),
+        "NOTA": plain_numbers(df["NOTA"]),
+        "CH": plain_numbers(df["CH"]),
+    }
+    return assemble_payloads(columns, CREATE_PROPERTIES, drop_empty=False)
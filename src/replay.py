@@ -0,0 +1,126 @@
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from logs import general_log
+from scraper import Scraper
+from table_extractor import TranscriptParseError
+from transcript_schema import apply_transcript_schema
+
+SOURCE_COLUMN = "ARQUIVO"
+
+
+def collect_pages(patterns: Iterable[str]) -> list[str]:
+    """
+    Expand directories and glob patterns into the list of saved transcript pages.
+
+    Parameters:
+        patterns (Iterable[str]): Directories (searched for *.html files) or glob patterns.
+
+    Returns:
+        list[str]: The sorted, de-duplicated page paths.
+    """
+    pages = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*.html")
+        pages.update(path for path in glob.glob(pattern) if os.path.isfile(path))
+    return sorted(pages)
+
+
+def parse_saved_page(file_path: str) -> pd.DataFrame:
+    """
+    Parse one saved transcript page with the same pipeline used while scraping.
+
+    Parameters:
+        file_path (str): The path to the saved page.
+
+    Returns:
+        pd.DataFrame: The transcript, with the source file name prepended.
+
+    Raises:
+        TranscriptParseError: If the page holds no transcript rows.
+    """
+    with open(file_path, encoding="utf-8", errors="replace") as file:
+        html = file.read()
+    df = Scraper(None).parse_page_source(html)
+    if df.empty:
+        raise TranscriptParseError(f"No transcript rows found in {file_path}.")
+    df.insert(0, SOURCE_COLUMN, os.path.basename(file_path))
+    return df
+
+
+def replay(
+    pages: list[str], workers: Optional[int] = None
+) -> tuple[pd.DataFrame, dict[str, str], float]:
+    """
+    Parse saved transcript pages in parallel with a process pool.
+
+    Parameters:
+        pages (list[str]): The saved page paths.
+        workers (Optional[int]): The number of processes. Defaults to the CPU count.
+
+    Returns:
+        tuple[pd.DataFrame, dict[str, str], float]: The combined transcripts, the error of
+            every page that failed and the throughput in pages per second.
+    """
+    frames, failures = [], {}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(parse_saved_page, page) for page in pages]
+        for page, future in zip(pages, futures):
+            try:
+                frames.append(future.result())
+            except Exception as e:
+                failures[page] = str(e)
+                general_log.logger.error(f"Failed to parse {page}: {e}")
+    elapsed = time.perf_counter() - start
+
+    data = (
+        apply_transcript_schema(pd.concat(frames, ignore_index=True))
+        if frames
+        else pd.DataFrame()
+    )
+    pages_per_second = len(pages) / elapsed if elapsed else 0.0
+    general_log.logger.info(
+        f"Replayed {len(pages)} pages in {elapsed:.2f}s ({pages_per_second:.1f} pages/s), "
+        f"{len(failures)} failed."
+    )
+    return data, failures, pages_per_second
+
+
+def main():
+    """
+    Command line entry point to re-parse saved transcript pages offline.
+    """
+    parser = argparse.ArgumentParser(
+        description="Re-parse saved SIAC transcript pages without a browser."
+    )
+    parser.add_argument("pages", nargs="+", help="Directories or glob patterns of pages.")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--output", default="replay.parquet", help="Parquet output file."
+    )
+    args = parser.parse_args()
+
+    pages = collect_pages(args.pages)
+    data, failures, pages_per_second = replay(pages, args.workers)
+    data.to_parquet(args.output, index=False)
+    print(
+        f"{len(pages)} pages, {len(data)} rows written to {args.output}; "
+        f"{len(failures)} failures; {pages_per_second:.1f} pages/s."
+    )
+    for page, error in failures.items():
+        print(f"{page}: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,62 +1,199 @@
-from typing import List
+import os
+import re
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Union
 
 import numpy as np
 import pandas as pd
-from selenium.webdriver.common.by import By
 
 from config import config
+from course_equivalence import CourseEquivalenceEngine
 from logs import general_log, return_log
+from table_extractor import TableExtractor, TranscriptParseError
+from transcript_schema import apply_transcript_schema
+
+TRANSCRIPT_HEADERS = [
+    "PERÍODO",
+    "CÓDIGO",
+    "MATÉRIA",
+    "CH",
+    "CR",
+    "NOTA",
+    "PCH",
+    "PCR",
+    "RES",
+]
+
+
+DEFAULT_FILTER_RULES = {
+    "exact": [
+        {"text": " ", "length": 1},
+        {"text": "Estudos Extracurriculares", "length": 1},
+        {"text": "Total Geral", "length": 1},
+        {"text": "Subtotal:", "length": 4},
+        {"text": "Período", "length": 6},
+    ],
+    "prefix": [{"text": "CH - Carga Horária", "length": 2}],
+    "regex": [],
+}
 
 
 class TableDataFilter:
     """
     A class to filter unwanted rows from table data.
+
+    The rules are matched against the first cell of a row and come in three kinds:
+    exact text, text prefix and regular expression, each optionally restricted to rows
+    with a given number of cells. They are compiled once into lookups keyed by row length.
     """
 
-    def filter_rows(self, data: List[List[str]]) -> List[List[str]]:
+    def __init__(self, rules: Optional[Dict[str, List[Dict[str, Any]]]] = None):
         """
-        Filter out unwanted rows from the table data.
+        Initialize the TableDataFilter and compile its rules.
 
         Parameters:
-            data (List[List[str]]): The table data to be filtered.
+            rules (Optional[dict]): The `exact`, `prefix` and `regex` rule lists.
+                Defaults to `table_filter` in the config.
+        """
+        rules = rules or config.get("table_filter") or DEFAULT_FILTER_RULES
+        self.hits: Counter = Counter()
+        self._exact: Dict[Optional[int], Dict[str, str]] = defaultdict(dict)
+        self._prefixes: Dict[Optional[int], Dict[str, str]] = defaultdict(dict)
+        patterns: Dict[Optional[int], List[str]] = defaultdict(list)
+        self._regex_names: Dict[str, str] = {}
+
+        for rule in rules.get("exact", []):
+            self._exact[rule.get("length")][rule["text"]] = self._rule_name("exact", rule)
+        for rule in rules.get("prefix", []):
+            self._prefixes[rule.get("length")][rule["text"]] = self._rule_name(
+                "prefix", rule
+            )
+        for index, rule in enumerate(rules.get("regex", [])):
+            group = f"rule{index}"
+            self._regex_names[group] = self._rule_name("regex", rule)
+            patterns[rule.get("length")].append(f"(?P<{group}>{rule['pattern']})")
+
+        self._prefix_tuples = {
+            length: tuple(prefixes) for length, prefixes in self._prefixes.items()
+        }
+        self._regexes = {
+            length: re.compile("|".join(group_patterns))
+            for length, group_patterns in patterns.items()
+        }
+
+    def filter_rows(
+        self, data: Union[List[List[str]], np.ndarray]
+    ) -> Union[List[List[str]], np.ndarray]:
+        """
+        Filter out unwanted rows from the table data in a single pass.
+
+        Parameters:
+            data (Union[List[List[str]], np.ndarray]): The table data to be filtered,
+                as a list of rows or a NumPy object array of rows.
 
         Returns:
-            List[List[str]]: The filtered table data.
-        """
-
-        def is_unwanted_row(row: List[str]) -> bool:
-            unwanted_patterns = [
-                (" ", 1),
-                ("Estudos Extracurriculares", 1),
-                ("Total Geral", 1),
-                ("Subtotal:", 4),
-                ("Período", 6),
-            ]
-            for pattern, length in unwanted_patterns:
-                if len(row) == length and row[0] == pattern:
-                    return True
-            return bool(len(row) == 2 and row[0].startswith("CH - Carga Horária"))
-
-        filtered_data = [row for row in data if not is_unwanted_row(row)]
-        return_log.logger.info(f"Data filtered as: {filtered_data}")
+            Union[List[List[str]], np.ndarray]: The filtered table data, of the same type as the input.
+        """
+        if isinstance(data, np.ndarray):
+            mask = np.fromiter(
+                (self.match_rule(row) is None for row in data),
+                dtype=bool,
+                count=len(data),
+            )
+            filtered_data = data[mask]
+        else:
+            filtered_data = [row for row in data if self.match_rule(row) is None]
+        general_log.logger.info(
+            f"Filtered {len(data) - len(filtered_data)} of {len(data)} rows. "
+            f"Rule hits: {dict(self.hits)}"
+        )
+        return_log.payload("Data filtered as: %s", filtered_data)
         return filtered_data
 
+    def match_rule(self, row: Sequence[str]) -> Optional[str]:
+        """
+        Return the name of the first rule matching the row and count the hit.
+
+        Parameters:
+            row (Sequence[str]): The row to check.
+
+        Returns:
+            Optional[str]: The name of the matching rule, or None if the row is wanted.
+        """
+        if not len(row):
+            return None
+        first_cell, length = row[0], len(row)
+        for key in (length, None):
+            if (name := self._exact.get(key, {}).get(first_cell)) is not None:
+                self.hits[name] += 1
+                return name
+        for key in (length, None):
+            prefixes = self._prefix_tuples.get(key)
+            if prefixes and first_cell.startswith(prefixes):
+                name = next(
+                    rule
+                    for prefix, rule in self._prefixes[key].items()
+                    if first_cell.startswith(prefix)
+                )
+                self.hits[name] += 1
+                return name
+        for key in (length, None):
+            regex = self._regexes.get(key)
+            if regex and (match := regex.match(first_cell)):
+                name = self._regex_names[match.lastgroup]
+                self.hits[name] += 1
+                return name
+        return None
+
+    def get_hit_counts(self) -> Dict[str, int]:
+        """
+        Return how many rows each rule has filtered out so far.
+
+        Returns:
+            Dict[str, int]: The hit count of every rule that matched at least once.
+        """
+        return dict(self.hits)
+
+    @staticmethod
+    def _rule_name(kind: str, rule: Dict[str, Any]) -> str:
+        """
+        Return the configured name of a rule or build one from its kind and text.
+
+        Parameters:
+            kind (str): The rule kind.
+            rule (dict): The rule definition.
+
+        Returns:
+            str: The rule name used in the hit counts.
+        """
+        return rule.get("name") or f"{kind}:{rule.get('text', rule.get('pattern'))}"
+
 
 class Scraper:
     """
     A class to handle scraping operations and convert table data to a Pandas DataFrame.
     """
 
-    def __init__(self, driver):
+    def __init__(self, driver, student_id: Optional[str] = None):
         """
-        Initialize the Scraper class with a Selenium WebDriver instance.
+        Initialize the Scraper class with a Selenium WebDriver or a SiacHttpSession instance.
 
         Parameters:
-            driver: Selenium WebDriver instance.
+            driver: Selenium WebDriver or SiacHttpSession instance. May be None when only
+                saved pages are parsed.
+            student_id (Optional[str]): Identifies the student in archived page file names.
         """
         self.driver = driver
+        self.student_id = student_id
         self.config = config
         self.filter = TableDataFilter()
+        self.equivalences = CourseEquivalenceEngine()
+        self.extractor = TableExtractor(
+            self.config.get("transcript", {}).get(
+                "header_signature", ["PERÍODO", "CÓDIGO"]
+            )
+        )
 
     def scrape_table(self) -> pd.DataFrame:
         """
@@ -69,15 +206,10 @@ class Scraper:
         general_log.logger.info("Navigating to completed courses page.")
 
         try:
+            self._archive_page_source()
             table_data = self._extract_table_data()
             general_log.logger.info("Extracted table data")
-            if len(table_data) > 8:
-                df = self._convert_table_to_dataframe(table_data)
-                df = self._calculate_weighted_average(df)
-                return df
-            else:
-                general_log.logger.warning("Not enough rows found in table.")
-                return pd.DataFrame()
+            return self.parse_table_data(table_data)
         except Exception as e:
             general_log.logger.error(
                 f"Failed to scrape and convert table to DataFrame: {e}"
@@ -86,6 +218,50 @@ class Scraper:
         finally:
             self.driver.quit()
 
+    def parse_table_data(self, table_data: List[List[str]]) -> pd.DataFrame:
+        """
+        Run the parsing pipeline on extracted transcript rows.
+
+        Parameters:
+            table_data (List[List[str]]): The transcript rows.
+
+        Returns:
+            pd.DataFrame: DataFrame containing the filtered data with the equivalences applied.
+        """
+        if not table_data:
+            general_log.logger.warning("Not enough rows found in table.")
+            return pd.DataFrame()
+        df = self._convert_table_to_dataframe(table_data)
+        return self._calculate_weighted_average(df)
+
+    def parse_page_source(self, html: str) -> pd.DataFrame:
+        """
+        Parse a saved transcript page without any browser or network access.
+
+        Parameters:
+            html (str): The page source.
+
+        Returns:
+            pd.DataFrame: DataFrame containing the filtered data with the equivalences applied.
+        """
+        return self.parse_table_data(self.extractor.extract_transcript_from_html(html))
+
+    def _archive_page_source(self) -> None:
+        """
+        Save the raw transcript page when `scraper.html_archive_dir` is configured.
+        """
+        archive_dir = self.config.get("scraper", {}).get("html_archive_dir")
+        if not archive_dir:
+            return
+        os.makedirs(archive_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path = os.path.join(
+            archive_dir, f"{self.student_id or 'transcript'}_{timestamp}.html"
+        )
+        with open(file_path, "w", encoding="utf-8") as file:
+            file.write(self.driver.page_source)
+        general_log.logger.info(f"Transcript page archived to {file_path}.")
+
     def _convert_table_to_dataframe(self, table_data: list) -> pd.DataFrame:
         """
         Convert extracted table data into a DataFrame and process it.
@@ -96,20 +272,8 @@ class Scraper:
         Returns:
             pd.DataFrame: The processed DataFrame.
         """
-        headers = [
-            "PERÍODO",
-            "CÓDIGO",
-            "MATÉRIA",
-            "CH",
-            "CR",
-            "NOTA",
-            "PCH",
-            "PCR",
-            "RES",
-        ]
-        data = table_data[36:-14]
-        filtered_data = self.filter.filter_rows(data)
-        df = pd.DataFrame(filtered_data, columns=headers)
+        filtered_data = self._validate_column_count(self.filter.filter_rows(table_data))
+        df = pd.DataFrame(filtered_data, columns=TRANSCRIPT_HEADERS)
 
         df["PERÍODO"] = df["PERÍODO"].replace("", None)
         df["PERÍODO"] = df["PERÍODO"].ffill()
@@ -119,15 +283,40 @@ class Scraper:
         return_log.logger.info(f"DataFrame created with shape: {df.shape}")
         general_log.logger.info("Table data successfully converted to DataFrame.")
 
-        return df.dropna(subset=["CÓDIGO"])
+        return apply_transcript_schema(df.dropna(subset=["CÓDIGO"]))
+
+    def _validate_column_count(self, table_data: List[List[str]]) -> List[List[str]]:
+        """
+        Keep only the rows with one cell per transcript column.
+
+        Parameters:
+            table_data (List[List[str]]): The filtered transcript rows.
+
+        Returns:
+            List[List[str]]: The rows matching the transcript layout.
+
+        Raises:
+            TranscriptParseError: If no row matches the transcript layout.
+        """
+        expected = len(TRANSCRIPT_HEADERS)
+        valid_rows = [row for row in table_data if len(row) == expected]
+        if skipped := len(table_data) - len(valid_rows):
+            general_log.logger.warning(
+                f"Skipped {skipped} transcript rows without {expected} columns."
+            )
+        if not valid_rows:
+            raise TranscriptParseError(
+                f"No transcript row with {expected} columns among {len(table_data)} rows."
+            )
+        return valid_rows
 
     def _clean_and_convert_column_to_numeric(self, df, arg1):
         """
         Replace placeholder values in a specified column of a DataFrame and convert it to numeric.
 
-        This function modifies the given DataFrame by replacing placeholder values with None,
-        converting the specified column to a numeric type, and ensuring that any NaN values
-        are also replaced with None. This is useful for cleaning data before analysis.
+        This function modifies the given DataFrame by replacing placeholder values with None
+        and converting the specified column to a numeric type. Missing values stay as NaN so
+        the column keeps a numeric dtype.
 
         Args:
             df: The DataFrame to be modified.
@@ -138,102 +327,26 @@ class Scraper:
         """
         df[arg1] = df[arg1].replace("--", None)
         df[arg1] = pd.to_numeric(df[arg1], errors="coerce")
-        df[arg1] = df[arg1].replace(np.nan, None)
 
     def _calculate_weighted_average(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Calculate the weighted average of the CH and Nota columns for specified codes and update the DataFrame.
-
-        Parameters:
-            df (pd.DataFrame): The DataFrame containing course data.
-
-        Returns:
-            pd.DataFrame: Updated DataFrame with calculated grades for FIS122, FIS123, and FIS121.
-        """
-        course_mappings = {
-            "FIS122": ["FISD34", "FISD41"],
-            "FIS123": ["FISD37", "FISD40"],
-            "FIS121": ["FISD36", "FISD42"],
-        }
-
-        for target_code, source_codes in course_mappings.items():
-            filtered_rows = df[df["CÓDIGO"].isin(source_codes)].copy()
-            if self._validate_source_codes(filtered_rows, source_codes):
-                df = self._update_course_grade(df, filtered_rows, target_code)
-
-        return df
-
-    def _validate_source_codes(
-        self, filtered_rows: pd.DataFrame, source_codes: list
-    ) -> bool:
-        """
-        Validate if there are valid notes and sufficient data for the given source codes.
-
-        Parameters:
-            filtered_rows (pd.DataFrame): The DataFrame containing the filtered rows.
-            source_codes (list): List of course codes to validate.
-
-        Returns:
-            bool: True if there are valid notes and sufficient data, otherwise False.
-        """
-        if filtered_rows.empty:
-            general_log.logger.warning(
-                f"No data found for source codes: {source_codes}"
-            )
-            return False
-        if filtered_rows["NOTA"].isna().all():
-            general_log.logger.warning(
-                f"All notes are missing for source codes: {source_codes}"
-            )
-            return False
-
-        return True
-
-    def _update_course_grade(
-        self, df: pd.DataFrame, filtered_rows: pd.DataFrame, target_code: str
-    ) -> pd.DataFrame:
-        """
-        Calculate the weighted average for a specific target course based on the source courses.
+        Calculate the CH-weighted grade of every equivalent target course and update the DataFrame.
 
         Parameters:
             df (pd.DataFrame): The DataFrame containing course data.
-            filtered_rows (pd.DataFrame): The DataFrame containing the filtered rows.
-            target_code (str): The course code to update.
 
         Returns:
-            pd.DataFrame: Updated DataFrame with the calculated grade for the target course.
+            pd.DataFrame: Updated DataFrame with the calculated grades of the target courses.
         """
-        total_ch = filtered_rows["CH"].sum()
-        weighted_sum = (filtered_rows["CH"] * filtered_rows["NOTA"]).sum()
-        weighted_avg = weighted_sum / total_ch if total_ch != 0 else 0
-
-        target_rows = df[(df["CÓDIGO"] == target_code) & (df["RES"] == "DI")]
-        if not target_rows.empty:
-            df.loc[(df["CÓDIGO"] == target_code) & (df["RES"] == "DI"), "NOTA"] = (
-                weighted_avg
-            )
-            df.loc[(df["CÓDIGO"] == target_code) & (df["RES"] == "DI"), "CH"] = total_ch
-            df.loc[(df["CÓDIGO"] == target_code) & (df["RES"] == "DI"), "RES"] = (
-                "AP" if weighted_avg >= 5 else "RR"
-            )
-
-            general_log.logger.info(
-                f"Updated {target_code} with weighted average Nota: {weighted_avg} "
-                f"and result: {'AP' if weighted_avg >= 5 else 'RR'}"
-            )
-
-        return df
+        return self.equivalences.apply(df)
 
     def _extract_table_data(self) -> List[List[str]]:
         """
-        Extract table data from the web page.
+        Extract the transcript table rows from the web page in a single round-trip.
 
         Returns:
-            List[List[str]]: The extracted table data.
+            List[List[str]]: The rows of the transcript table.
         """
-        rows = self.driver.find_elements(By.CSS_SELECTOR, "table tr")
-        table_data = [
-            [col.text for col in row.find_elements(By.TAG_NAME, "td")] for row in rows
-        ]
-        return_log.logger.info(f"Raw table data extracted: {table_data}")
+        table_data = self.extractor.extract_transcript(self.driver)
+        return_log.payload("Raw table data extracted: %s", table_data)
         return table_data
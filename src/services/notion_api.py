@@ -1,41 +1,223 @@
+import asyncio
+import atexit
+import functools
 import os
+import random
 import sys
-from typing import Any, Dict, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 from logs import general_log, return_log
+from services.page_state import PageStateCache
+from services.rate_limiter import TokenBucket
+from services.sync_journal import get_sync_journal
+
+NOTION_VERSION = "2022-06-28"
+IDEMPOTENT_METHODS = {"GET", "PATCH", "PUT", "DELETE"}
+RETRYABLE_STATUSES = {500, 502, 503, 504}
+MAX_FILTER_CONDITIONS = 100
+TITLE_PROPERTY_ID = "title"
+
+
+class NotionAPIError(RuntimeError):
+    """
+    Raised when Notion answers a read request with an error, so callers never mistake it for
+    an empty result.
+    """
+
+    def __init__(self, message: str, status_code: int, text: str):
+        super().__init__(f"{message}: {status_code} - {text}")
+        self.status_code = status_code
+        self.text = text
+
+
+@functools.lru_cache(maxsize=None)
+def get_session(token: str, pool_size: int, retries: int) -> requests.Session:
+    """
+    Return the keep-alive session shared by every factory using the same token.
+
+    Parameters:
+        token (str): The Notion integration token.
+        pool_size (int): The maximum number of connections kept open to Notion.
+        retries (int): The number of retries on connection errors.
+
+    Returns:
+        requests.Session: The pooled session, with the Notion headers preset.
+    """
+    general_log.logger.info(f"Opening a Notion session with {pool_size} connections.")
+    session = requests.Session()
+    session.headers.update(
+        {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+            "Notion-Version": NOTION_VERSION,
+        }
+    )
+    retry = Retry(total=retries, backoff_factor=0.5)
+    adapter = HTTPAdapter(
+        pool_connections=1, pool_maxsize=pool_size, max_retries=retry
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    atexit.register(session.close)
+    return session
+
+
+def build_code_filters(
+    codes: Iterable[str], chunk_size: int = MAX_FILTER_CONDITIONS
+) -> Iterator[Dict[str, Any]]:
+    """
+    Build compound query filters matching pages whose CÓDIGO is one of the given codes.
+
+    Notion caps the conditions of a compound filter, so the codes are split into chunks.
+
+    Parameters:
+        codes (Iterable[str]): The codes to match.
+        chunk_size (int): The maximum number of codes per filter.
+
+    Yields:
+        Dict[str, Any]: An "or" filter for each chunk of codes.
+    """
+    codes = list(codes)
+    for start in range(0, len(codes), chunk_size):
+        yield {
+            "or": [
+                {"property": "CÓDIGO", "title": {"equals": code}}
+                for code in codes[start : start + chunk_size]
+            ]
+        }
+
+
+@functools.lru_cache(maxsize=None)
+def get_rate_limiter(token: str, rate: float, burst: int) -> TokenBucket:
+    """
+    Return the token bucket shared by every factory using the same token.
+
+    Parameters:
+        token (str): The Notion integration token.
+        rate (float): The average number of requests allowed per second.
+        burst (int): The maximum number of requests sent back to back.
+
+    Returns:
+        TokenBucket: The shared rate limiter.
+    """
+    return TokenBucket(rate, burst)
 
 
 class NotionAdapter:
-    """Adapter class to fetch Notion API configuration details."""
+    """Adapter class to fetch Notion API configuration details and send requests."""
 
     def __init__(self, config: Dict[str, Any]):
         general_log.logger.info(
             "Initializing NotionAdapter with provided configuration."
         )
+        notion_config = config["notion"]
         self.token = config["notion_login"]["token"]
-        self.url = config["notion"]["url"]
+        self.url = notion_config["url"]
+        self.timeout = tuple(notion_config.get("timeout", [5, 30]))
+        self.session = get_session(
+            self.token,
+            notion_config.get("pool_size", 10),
+            notion_config.get("retries", 3),
+        )
+        self.headers = dict(self.session.headers)
+        rate_limit = notion_config.get("rate_limit", {})
+        self.rate_limiter = get_rate_limiter(
+            self.token, rate_limit.get("rate", 3), rate_limit.get("burst", 3)
+        )
+        self.max_retries = rate_limit.get("max_retries", 5)
+        self.backoff_base = rate_limit.get("backoff_base", 0.5)
+        self.backoff_cap = rate_limit.get("backoff_cap", 30)
 
     def get_headers(self) -> Dict[str, str]:
         """Return the headers required for Notion API requests."""
-        general_log.logger.info("Generating headers for Notion API requests.")
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json",
-            "Notion-Version": "2022-06-28",
-        }
-        return_log.logger.info(f"Headers: {headers}")
-        return headers
+        return self.headers
 
     def get_base_url(self) -> str:
         """Return the Notion base URL."""
-        general_log.logger.info("Fetching base URL for Notion API.")
-        return_log.logger.info(f"Base URL: {self.url}")
         return self.url
 
+    def request(
+        self,
+        method: str,
+        path: str,
+        idempotent: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        Send a rate limited request to the Notion API over the pooled session.
+
+        A 429 response is retried after its `Retry-After` delay. A 5xx response is retried
+        with jittered exponential backoff when the request is idempotent.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The endpoint path, relative to the base URL.
+            idempotent (Optional[bool]): Whether the request is safe to repeat. Defaults to
+                True for GET, PATCH, PUT and DELETE.
+            **kwargs: Forwarded to `requests.Session.request`.
+
+        Returns:
+            Response: The last response from the Notion API.
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        kwargs.setdefault("timeout", self.timeout)
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            response = self.session.request(method, f"{self.url}{path}", **kwargs)
+            if attempt == self.max_retries:
+                break
+            if response.status_code == 429:
+                delay = self._retry_after(response, attempt)
+                self.rate_limiter.pause(delay)
+            elif response.status_code in RETRYABLE_STATUSES and idempotent:
+                delay = self._backoff(attempt)
+                time.sleep(delay)
+            else:
+                break
+            self.rate_limiter.record_retry()
+            general_log.logger.warning(
+                f"Notion returned {response.status_code} for {method} {path}, "
+                f"retrying in {delay:.2f}s (attempt {attempt + 1}/{self.max_retries})."
+            )
+        return response
+
+    def _retry_after(self, response: requests.Response, attempt: int) -> float:
+        """
+        Read the delay requested by a 429 response, falling back to the backoff delay.
+
+        Args:
+            response (Response): The throttled response.
+            attempt (int): The zero-based attempt number.
+
+        Returns:
+            float: The number of seconds to wait.
+        """
+        try:
+            return float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            return self._backoff(attempt)
+
+    def _backoff(self, attempt: int) -> float:
+        """
+        Compute a full-jitter exponential backoff delay.
+
+        Args:
+            attempt (int): The zero-based attempt number.
+
+        Returns:
+            float: The number of seconds to wait.
+        """
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2**attempt))
+
 
 class NotionRequestFactory:
     """Factory class to create Notion API requests."""
@@ -47,6 +229,9 @@ class NotionRequestFactory:
         self.notion_adapter = NotionAdapter(config)
         self.type = type
         self.database_id = database_id
+        self.page_state = PageStateCache(config["notion"].get("dirty_check", True))
+        self.journal = get_sync_journal(config.get("sync", {}).get("journal"))
+        self._property_ids: Optional[Dict[str, str]] = None
         return_log.logger.info(f"Database ID: {self.database_id}")
 
     def create_page(self, data: Dict[str, Any]) -> requests.Response:
@@ -60,65 +245,154 @@ class NotionRequestFactory:
             Response: The response from the Notion API.
         """
         general_log.logger.info("Creating a new page in the Notion database.")
-        create_url = f"{self.notion_adapter.get_base_url()}/pages"
         payload = {
             "parent": {"database_id": self.database_id},
             "properties": data,
         }
-        return_log.logger.info(f"Payload for creating page: {payload}")
-        response = requests.post(
-            create_url, headers=self.notion_adapter.get_headers(), json=payload
-        )
+        sampled = return_log.sample_payload()
+        return_log.payload("Payload for creating page: %s", payload, sampled=sampled)
+        response = self.notion_adapter.request("POST", "/pages", json=payload)
         general_log.logger.info("Page creation request sent.")
-        return_log.logger.info(
-            f"Response from Notion API: {response.status_code} - {response.text}"
+        return_log.payload(
+            "Response from Notion API: %s - %s",
+            response.status_code,
+            response.text,
+            sampled=sampled,
         )
         return response
 
-    def get_pages(self, num_pages: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_pages(
+        self,
+        num_pages: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None,
+        filter_properties: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Retrieve pages from the Notion database.
 
         Args:
             num_pages (Optional[int]): The number of pages to fetch. If None, fetch all.
+            filter (Optional[dict]): A Notion query filter. If None, fetch every page.
+            filter_properties (Optional[List[str]]): The IDs of the properties to return.
+                If None, return every property.
 
         Returns:
             List[Dict]: The list of pages.
+
+        Raises:
+            NotionAPIError: If Notion answers a batch with an error.
+        """
+        return list(self.iter_pages(num_pages, filter, filter_properties))
+
+    def iter_pages(
+        self,
+        num_pages: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None,
+        filter_properties: Optional[List[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream pages from the Notion database as they arrive.
+
+        While the caller consumes a batch, the next one is fetched in the background, so at
+        most two batches are held in memory.
+
+        Args:
+            num_pages (Optional[int]): The number of pages to fetch. If None, fetch all.
+            filter (Optional[dict]): A Notion query filter. If None, fetch every page.
+            filter_properties (Optional[List[str]]): The IDs of the properties to return.
+                If None, return every property.
+
+        Yields:
+            Dict: The pages, in query order.
+
+        Raises:
+            NotionAPIError: If Notion answers a batch with an error.
         """
         get_all = num_pages is None
         page_size = 100 if get_all else num_pages
         general_log.logger.info(
             f"Fetching pages from Notion database with num_pages={page_size}."
         )
-        query_url = (
-            f"{self.notion_adapter.get_base_url()}/databases/{self.database_id}/query"
-        )
+        query_path = f"/databases/{self.database_id}/query"
         payload = {"page_size": page_size}
-        return_log.logger.info(f"Initial payload for fetching pages: {payload}")
-        response = requests.post(
-            query_url, json=payload, headers=self.notion_adapter.get_headers()
-        )
-        return_log.logger.info(
-            f"Response from Notion API: {response.status_code} - {response.text}"
-        )
+        if filter:
+            payload["filter"] = filter
+        params = {"filter_properties": filter_properties} if filter_properties else None
+        return_log.payload("Initial payload for fetching pages: %s", payload)
 
-        data = response.json()
-        return_log.logger.info(f"Initial response data: {data}")
-        results = data.get("results", [])
-        while data.get("has_more") and get_all:
-            general_log.logger.info(
-                "Fetching additional pages from Notion (pagination)."
-            )
-            payload["start_cursor"] = data["next_cursor"]
-            response = requests.post(
-                query_url, json=payload, headers=self.notion_adapter.get_headers()
+        def fetch(cursor: Optional[str]) -> Dict[str, Any]:
+            body = {**payload, "start_cursor": cursor} if cursor else payload
+            response = self.notion_adapter.request(
+                "POST", query_path, idempotent=True, params=params, json=body
             )
+            if response.status_code != 200:
+                general_log.logger.error(
+                    f"Failed to fetch pages from Notion: {response.status_code} - {response.text}"
+                )
+                raise NotionAPIError(
+                    "Failed to fetch pages from Notion", response.status_code, response.text
+                )
             data = response.json()
-            return_log.logger.info(f"Additional response data: {data}")
-            results.extend(data.get("results", []))
+            return_log.logger.info(
+                f"Response from Notion API: {response.status_code} - "
+                f"{len(data.get('results', []))} pages, has_more={data.get('has_more')}"
+            )
+            return data
 
-        general_log.logger.info(f"Total pages fetched: {len(results)}")
-        return results
+        total = 0
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            data = fetch(None)
+            while True:
+                next_batch = (
+                    executor.submit(fetch, data["next_cursor"])
+                    if get_all and data.get("has_more")
+                    else None
+                )
+                results = data.get("results", [])
+                total += len(results)
+                yield from results
+                if next_batch is None:
+                    break
+                general_log.logger.info(
+                    "Fetching additional pages from Notion (pagination)."
+                )
+                data = next_batch.result()
+
+        general_log.logger.info(f"Total pages fetched: {total}")
+
+    def get_property_ids(self, names: Iterable[str]) -> List[str]:
+        """
+        Translate property names into the IDs expected by `filter_properties`.
+
+        The database schema is fetched once and cached. A failed fetch is not cached.
+
+        Args:
+            names (Iterable[str]): The property names.
+
+        Returns:
+            List[str]: The IDs of the properties that exist in the database.
+
+        Raises:
+            NotionAPIError: If the database schema cannot be fetched.
+        """
+        if self._property_ids is None:
+            response = self.notion_adapter.request(
+                "GET", f"/databases/{self.database_id}"
+            )
+            if response.status_code != 200:
+                general_log.logger.error(
+                    f"Failed to fetch the Notion database schema: {response.status_code} - {response.text}"
+                )
+                raise NotionAPIError(
+                    "Failed to fetch the Notion database schema",
+                    response.status_code,
+                    response.text,
+                )
+            properties = response.json().get("properties", {})
+            self._property_ids = {
+                name: prop["id"] for name, prop in properties.items()
+            }
+        return [self._property_ids[name] for name in names if name in self._property_ids]
 
     def update_page(self, page_id: str, data: Dict[str, Any]) -> requests.Response:
         """
@@ -132,15 +406,18 @@ class NotionRequestFactory:
             Response: The response from the Notion API.
         """
         general_log.logger.info(f"Updating page with ID: {page_id}.")
-        update_url = f"{self.notion_adapter.get_base_url()}/pages/{page_id}"
         payload = {"properties": data}
-        return_log.logger.info(f"Payload for updating page: {payload}")
-        response = requests.patch(
-            update_url, headers=self.notion_adapter.get_headers(), json=payload
+        sampled = return_log.sample_payload()
+        return_log.payload("Payload for updating page: %s", payload, sampled=sampled)
+        response = self.notion_adapter.request(
+            "PATCH", f"/pages/{page_id}", json=payload
         )
         general_log.logger.info(f"Page update request sent for page ID: {page_id}.")
-        return_log.logger.info(
-            f"Response from Notion API: {response.status_code} - {response.text}"
+        return_log.payload(
+            "Response from Notion API: %s - %s",
+            response.status_code,
+            response.text,
+            sampled=sampled,
         )
         return response
 
@@ -162,16 +439,108 @@ class NotionRequestFactory:
         Returns:
             tuple[int, str]: The status code and response text from the API.
         """
-        test_url = f"{self.notion_adapter.get_base_url()}/users"
-        response = requests.get(test_url, headers=self.notion_adapter.get_headers())
+        response = self.notion_adapter.request("GET", "/users")
         general_log.logger.info("Checking connection to Notion API.")
-        return_log.logger.info(
-            f"Response from Notion API: {response.status_code} - {response.text}"
+        return_log.payload(
+            "Response from Notion API: %s - %s", response.status_code, response.text
         )
 
         return response.status_code, response.text
 
 
+class AsyncNotionRequestFactory:
+    """
+    Asynchronous counterpart of NotionRequestFactory with a bounded number of requests in flight.
+
+    This is not a native async HTTP client: the blocking requests of the wrapped factory run
+    on worker threads through `asyncio.to_thread`, over its pooled session, so they share its
+    connections, headers, timeouts and rate limiter.
+    """
+
+    def __init__(self, notion_factory: NotionRequestFactory, max_in_flight: int = 8):
+        general_log.logger.info(
+            f"Initializing AsyncNotionRequestFactory with {max_in_flight} requests in flight."
+        )
+        self.notion_factory = notion_factory
+        self.notion_adapter = notion_factory.notion_adapter
+        self.type = notion_factory.type
+        self.database_id = notion_factory.database_id
+        self.page_state = notion_factory.page_state
+        self.journal = notion_factory.journal
+        self.max_in_flight = max_in_flight
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def _run(self, method, *args: Any) -> Any:
+        """
+        Run a request of the wrapped factory on a worker thread once a slot is free.
+
+        Args:
+            method: The bound NotionRequestFactory method.
+            *args: The method arguments.
+
+        Returns:
+            The method result.
+        """
+        async with self._semaphore:
+            return await asyncio.to_thread(method, *args)
+
+    async def create_page(self, data: Dict[str, Any]) -> requests.Response:
+        """
+        Create a new page in the Notion database.
+
+        Args:
+            data (dict): The page properties.
+
+        Returns:
+            Response: The response from the Notion API.
+        """
+        return await self._run(self.notion_factory.create_page, data)
+
+    async def get_pages(
+        self,
+        num_pages: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None,
+        filter_properties: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve pages from the Notion database.
+
+        Args:
+            num_pages (Optional[int]): The number of pages to fetch. If None, fetch all.
+            filter (Optional[dict]): A Notion query filter. If None, fetch every page.
+            filter_properties (Optional[List[str]]): The IDs of the properties to return.
+                If None, return every property.
+
+        Returns:
+            List[Dict]: The list of pages.
+        """
+        return await self._run(
+            self.notion_factory.get_pages, num_pages, filter, filter_properties
+        )
+
+    async def update_page(self, page_id: str, data: Dict[str, Any]) -> requests.Response:
+        """
+        Update a page in the Notion database.
+
+        Args:
+            page_id (str): The ID of the page to update.
+            data (dict): The properties to update.
+
+        Returns:
+            Response: The response from the Notion API.
+        """
+        return await self._run(self.notion_factory.update_page, page_id, data)
+
+    def get_type(self) -> str:
+        """
+        Retrieve the type of the wrapped factory.
+
+        Returns:
+            str: The type of the instance.
+        """
+        return self.type
+
+
 # def process_pages(notion_request_factory: NotionRequestFactory):
 #     """Process pages from Notion, iterating through properties."""
 #     pages = notion_request_factory.get_pages()
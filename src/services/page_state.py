@@ -0,0 +1,159 @@
+import math
+import threading
+from typing import Any, Dict, Iterable, Iterator
+
+TRACKED_PROPERTIES = ("NOTA", "CH", "PERÍODO")
+
+
+def get_property_value(prop: Dict[str, Any]) -> Any:
+    """
+    Reduce a Notion property, as read from a page or sent in a payload, to its plain value.
+
+    Parameters:
+        prop (Dict[str, Any]): The property object.
+
+    Returns:
+        The number, or the concatenated text of a title or rich text property.
+    """
+    kind = prop.get("type") or next(
+        (key for key in ("number", "rich_text", "title") if key in prop), None
+    )
+    value = prop.get(kind)
+    if kind in ("rich_text", "title"):
+        return "".join(
+            part.get("plain_text") or part.get("text", {}).get("content", "")
+            for part in value or []
+        )
+    return value
+
+
+def extract_page_values(page: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract the plain values of the tracked properties of a Notion page.
+
+    Parameters:
+        page (Dict[str, Any]): The Notion page.
+
+    Returns:
+        Dict[str, Any]: The values, keyed by property name, of the tracked properties present.
+    """
+    properties = page.get("properties", {})
+    return {
+        name: get_property_value(properties[name])
+        for name in TRACKED_PROPERTIES
+        if name in properties
+    }
+
+
+def values_equal(current: Any, new: Any) -> bool:
+    """
+    Compare two property values, tolerating float rounding on numbers.
+
+    Parameters:
+        current: The value stored in Notion.
+        new: The value about to be sent.
+
+    Returns:
+        bool: True if sending the new value would not change the page.
+    """
+    if isinstance(current, (int, float)) and isinstance(new, (int, float)):
+        return math.isclose(current, new, rel_tol=1e-6)
+    return current == new
+
+
+class PageStateCache:
+    """
+    A class to remember the current property values of the Notion pages of a database.
+
+    Updates whose payload matches the remembered values are reported as unchanged, so the
+    PATCH can be skipped.
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        Initialize the PageStateCache.
+
+        Parameters:
+            enabled (bool): Whether unchanged updates are detected at all.
+        """
+        self.enabled = enabled
+        self.skipped = 0
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def track(self, pages: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Record the values of the pages while passing them through.
+
+        Parameters:
+            pages (Iterable[Dict[str, Any]]): The Notion pages.
+
+        Yields:
+            Dict[str, Any]: The same pages.
+        """
+        for page in pages:
+            self.remember(page["id"], extract_page_values(page))
+            yield page
+
+    def remember(self, page_id: str, values: Dict[str, Any]) -> None:
+        """
+        Record the current values of a page.
+
+        Parameters:
+            page_id (str): The Notion page ID.
+            values (Dict[str, Any]): The plain values, keyed by property name.
+        """
+        with self._lock:
+            self._records.setdefault(page_id, {}).update(values)
+
+    def remember_update(self, page_id: str, data: Dict[str, Any]) -> None:
+        """
+        Record the values of a payload successfully sent to a page.
+
+        Parameters:
+            page_id (str): The Notion page ID.
+            data (Dict[str, Any]): The properties sent.
+        """
+        self.remember(
+            page_id, {name: get_property_value(prop) for name, prop in data.items()}
+        )
+
+    def get_values(self, name: str) -> Dict[str, Any]:
+        """
+        Return the remembered value of one property for every page that has it.
+
+        Parameters:
+            name (str): The property name.
+
+        Returns:
+            Dict[str, Any]: The values, keyed by page ID.
+        """
+        with self._lock:
+            return {
+                page_id: record[name]
+                for page_id, record in self._records.items()
+                if record.get(name) is not None
+            }
+
+    def is_unchanged(self, page_id: str, data: Dict[str, Any]) -> bool:
+        """
+        Check if a payload would leave the page as it is, counting it as skipped if so.
+
+        Parameters:
+            page_id (str): The Notion page ID.
+            data (Dict[str, Any]): The properties about to be sent.
+
+        Returns:
+            bool: True if every property of the payload already has that value.
+        """
+        if not self.enabled:
+            return False
+        with self._lock:
+            record = self._records.get(page_id)
+            unchanged = record is not None and all(
+                name in record and values_equal(record[name], get_property_value(prop))
+                for name, prop in data.items()
+            )
+            if unchanged:
+                self.skipped += 1
+        return unchanged
@@ -0,0 +1,92 @@
+import threading
+import time
+from typing import Dict
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket shared by every request sent with the same credentials.
+
+    Tokens refill at `rate` per second up to `burst`. A server-side throttle can also pause
+    the bucket, so every caller waits out a `Retry-After` instead of only the one that got it.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Initialize the TokenBucket.
+
+        Parameters:
+            rate (float): The average number of requests allowed per second.
+            burst (int): The maximum number of requests that can be sent back to back.
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.throttled_requests = 0
+        self.throttled_seconds = 0.0
+        self.retries = 0
+
+    def acquire(self) -> float:
+        """
+        Take a token, sleeping until one is available.
+
+        Returns:
+            float: The number of seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                delay = max(self._paused_until - now, 0.0)
+                if not delay and self._tokens >= 1:
+                    self._tokens -= 1
+                    self.requests += 1
+                    if waited:
+                        self.throttled_requests += 1
+                        self.throttled_seconds += waited
+                    return waited
+                delay = delay or (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold every caller for the given time, as requested by a `Retry-After` header.
+
+        Parameters:
+            seconds (float): The number of seconds to pause.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+    def record_retry(self) -> None:
+        """
+        Count a request sent again after a throttle or a server error.
+        """
+        with self._lock:
+            self.retries += 1
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Return the counters of the bucket.
+
+        Returns:
+            Dict[str, float]: The requests sent, how many of them waited, the total time
+                spent waiting in seconds and the number of retries.
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "throttled_requests": self.throttled_requests,
+                "throttled_seconds": round(self.throttled_seconds, 3),
+                "retries": self.retries,
+            }
@@ -0,0 +1,142 @@
+from html.parser import HTMLParser
+from typing import Any, Dict, Optional
+from urllib.parse import urljoin
+
+import requests
+
+from logs import general_log, return_log
+
+LOGIN_SUCCESS_MARKER = "changeDisplayS(17,18);"
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36"
+)
+
+
+class _LoginFormParser(HTMLParser):
+    """
+    HTML parser that collects the action and the hidden inputs of the SIAC login form.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.action: Optional[str] = None
+        self.fields: Dict[str, str] = {}
+        self._in_login_form = False
+        self._form_action = ""
+        self._form_fields: Dict[str, str] = {}
+        self._has_password = False
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        attributes = dict(attrs)
+        if tag == "form" and self.action is None:
+            self._in_login_form = True
+            self._form_action = attributes.get("action") or ""
+            self._form_fields = {}
+            self._has_password = False
+        elif tag == "input" and self._in_login_form:
+            name = attributes.get("name")
+            if name == "senha":
+                self._has_password = True
+            elif name and attributes.get("type", "text").lower() == "hidden":
+                self._form_fields[name] = attributes.get("value") or ""
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "form" and self._in_login_form:
+            self._in_login_form = False
+            if self._has_password:
+                self.action = self._form_action
+                self.fields = self._form_fields
+
+
+class SiacHttpSession:
+    """
+    A browserless SIAC client exposing the subset of the WebDriver interface used by `Scraper`.
+
+    The session logs in by posting the `cpf`/`senha` form, keeps the session cookies and
+    serves the fetched HTML through `page_source`.
+    """
+
+    def __init__(self, config: Dict[str, Any], session: Optional[requests.Session] = None):
+        """
+        Initialize the SiacHttpSession with the given configuration.
+
+        Parameters:
+            config (dict): The application configuration.
+            session (Optional[requests.Session]): The HTTP session to use. A new one is created if None.
+        """
+        self.config = config
+        self.session = session or requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        self.timeout = config.get("timeout", {}).get("page_load", 20)
+        self.current_url: Optional[str] = None
+        self.page_source = ""
+
+    def login(self, cpf: str, password: str) -> None:
+        """
+        Log in to SIAC by submitting the login form.
+
+        Parameters:
+            cpf (str): CPF of the user.
+            password (str): Password of the user.
+
+        Raises:
+            ValueError: If SIAC rejects the credentials.
+            requests.RequestException: If SIAC cannot be reached.
+        """
+        login_url = self.config["siac"]["login_url"]
+        general_log.logger.info("Opening SIAC login page over HTTP.")
+        self.get(login_url)
+        form = _LoginFormParser()
+        form.feed(self.page_source)
+        form.close()
+        if form.action is None:
+            raise RuntimeError("SIAC login form not found.")
+        payload = {**form.fields, "cpf": cpf, "senha": password, "x": "0", "y": "0"}
+        response = self.session.post(
+            urljoin(self.current_url, form.action), data=payload, timeout=self.timeout
+        )
+        response.raise_for_status()
+        self._store_response(response)
+        if not self.is_logged_in():
+            raise ValueError("Wrong CPF or Password.")
+        general_log.logger.info("Logged in to SIAC over HTTP.")
+
+    def is_logged_in(self) -> bool:
+        """
+        Check if the last fetched page belongs to a logged in session.
+
+        Returns:
+            bool: True if login is successful, otherwise False.
+        """
+        return LOGIN_SUCCESS_MARKER in self.page_source
+
+    def get(self, url: str) -> None:
+        """
+        Fetch the given URL with the session cookies.
+
+        Parameters:
+            url (str): The URL to fetch.
+        """
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        self._store_response(response)
+
+    def quit(self) -> None:
+        """
+        Close the HTTP session.
+        """
+        self.session.close()
+
+    def _store_response(self, response: requests.Response) -> None:
+        """
+        Keep the URL and the decoded body of the last response.
+
+        Parameters:
+            response (requests.Response): The response to store.
+        """
+        self.current_url = response.url
+        self.page_source = response.text
+        return_log.logger.info(
+            f"SIAC HTTP response: {response.status_code} - {response.url}"
+        )
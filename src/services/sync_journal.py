@@ -0,0 +1,181 @@
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from logs import general_log
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS operations (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    database_id TEXT NOT NULL,
+    target TEXT NOT NULL,
+    payload_hash TEXT NOT NULL,
+    status TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+def hash_payload(data: Dict[str, Any]) -> str:
+    """
+    Compute a content hash of a Notion payload.
+
+    Parameters:
+        data (Dict[str, Any]): The page properties.
+
+    Returns:
+        str: The SHA-256 hex digest of the canonical JSON payload.
+    """
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SyncJournal:
+    """
+    A write-ahead journal of the Notion operations of a sync run.
+
+    Every create or update is recorded before it is sent and marked done once Notion answers
+    200. When a run dies halfway, the next one replays the same operations in the same order
+    and skips those already done, so retried creates do not duplicate pages. The operations of
+    a database are cleared once a run finishes them all.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the SyncJournal.
+
+        Parameters:
+            path (str): The SQLite file, or ":memory:" for a journal that does not survive the run.
+        """
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+        self._occurrences: Counter = Counter()
+        self._lock = threading.Lock()
+        done, pending = self._counts()
+        if done or pending:
+            general_log.logger.info(
+                f"Resuming interrupted sync: {done} operations done, {pending} incomplete."
+            )
+
+    def begin(
+        self, kind: str, database_id: str, target: str, data: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Record an operation about to be sent, unless a previous attempt already completed it.
+
+        Parameters:
+            kind (str): "create" or "update".
+            database_id (str): The Notion database ID.
+            target (str): The page ID of an update, or the code of a create.
+            data (Dict[str, Any]): The page properties.
+
+        Returns:
+            Optional[str]: The key of the operation, or None if it is already done.
+        """
+        payload_hash = hash_payload(data)
+        base_key = f"{kind}:{database_id}:{target}:{payload_hash}"
+        with self._lock:
+            key = f"{base_key}:{self._occurrences[base_key]}"
+            self._occurrences[base_key] += 1
+            row = self._connection.execute(
+                "SELECT status FROM operations WHERE key = ?", (key,)
+            ).fetchone()
+            if row and row[0] == "done":
+                return None
+            with self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO operations VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        kind,
+                        database_id,
+                        target,
+                        payload_hash,
+                        "planned",
+                        datetime.now().isoformat(timespec="seconds"),
+                    ),
+                )
+        return key
+
+    def complete(self, key: str) -> None:
+        """
+        Mark an operation as done.
+
+        Parameters:
+            key (str): The key returned by `begin`.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE operations SET status = 'done', updated_at = ? WHERE key = ?",
+                (datetime.now().isoformat(timespec="seconds"), key),
+            )
+
+    def clear(self, database_id: Optional[str] = None) -> None:
+        """
+        Forget the operations of a sync run once it has finished cleanly.
+
+        Parameters:
+            database_id (Optional[str]): Only forget the operations on this database. If None,
+                forget every operation.
+        """
+        with self._lock, self._connection:
+            if database_id is None:
+                self._connection.execute("DELETE FROM operations")
+                self._occurrences.clear()
+                return
+            self._connection.execute(
+                "DELETE FROM operations WHERE database_id = ?", (database_id,)
+            )
+            for base_key in [
+                key for key in self._occurrences if key.split(":")[1] == database_id
+            ]:
+                del self._occurrences[base_key]
+
+    def _counts(self) -> tuple[int, int]:
+        """
+        Count the journaled operations.
+
+        Returns:
+            tuple[int, int]: The number of done and incomplete operations.
+        """
+        counts = dict(
+            self._connection.execute(
+                "SELECT status, COUNT(*) FROM operations GROUP BY status"
+            ).fetchall()
+        )
+        return counts.get("done", 0), counts.get("planned", 0)
+
+
+@functools.lru_cache(maxsize=None)
+def get_sync_journal(path: Optional[str]) -> SyncJournal:
+    """
+    Return the journal shared by every factory writing to the same file.
+
+    Parameters:
+        path (Optional[str]): The SQLite file, relative to the project root. If None, the
+            journal is kept in memory and a crashed run cannot be resumed.
+
+    Returns:
+        SyncJournal: The shared journal.
+    """
+    if path is None:
+        return SyncJournal(":memory:")
+    if getattr(sys, "frozen", False):
+        base_path = os.path.dirname(sys.executable)
+    else:
+        base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    return SyncJournal(os.path.join(base_path, path))
@@ -0,0 +1,102 @@
+from typing import Union
+
+import requests
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+
+from config import config
+from driver_pool import PooledDriver, get_driver_pool
+from logs import general_log
+from services.siac_http import SiacHttpSession
+
+
+def login(cpf: str, password: str) -> Union[PooledDriver, SiacHttpSession]:
+    """
+    Log in to SIAC using the configured scraping backend.
+
+    The HTTP backend is tried first when selected in the configuration; Selenium
+    WebDriver is used otherwise or whenever the HTTP login cannot be completed.
+
+    Parameters:
+        cpf (str): CPF of the user.
+        password (str): Password of the user.
+
+    Returns:
+        Union[PooledDriver, SiacHttpSession]: The logged in driver consumed by `Scraper`.
+
+    Raises:
+        ValueError: If SIAC rejects the credentials.
+    """
+    if config.get("scraper", {}).get("backend", "selenium") == "http":
+        try:
+            return http_login(cpf, password)
+        except (requests.RequestException, RuntimeError) as e:
+            general_log.logger.warning(
+                f"HTTP login failed, falling back to Selenium: {e}"
+            )
+    return selenium_login(cpf, password)
+
+
+def http_login(cpf: str, password: str) -> SiacHttpSession:
+    """
+    Log in to SIAC using a browserless HTTP session.
+
+    Parameters:
+        cpf (str): CPF of the user.
+        password (str): Password of the user.
+
+    Returns:
+        SiacHttpSession: The logged in HTTP session.
+    """
+    session = SiacHttpSession(config)
+    try:
+        session.login(cpf, password)
+    except Exception:
+        session.quit()
+        raise
+    return session
+
+
+def selenium_login(cpf: str, password: str) -> PooledDriver:
+    """
+    Log in to SIAC using a warm WebDriver taken from the driver pool.
+
+    Parameters:
+        cpf (str): CPF of the user.
+        password (str): Password of the user.
+
+    Returns:
+        PooledDriver: The logged in WebDriver, returned to the pool when quit.
+    """
+    driver = get_driver_pool().acquire()
+    try:
+        driver.get(config["siac"]["login_url"])
+        driver.find_element(By.NAME, "cpf").send_keys(cpf)
+        driver.find_element(By.NAME, "senha").send_keys(password)
+        driver.find_element(
+            By.CSS_SELECTOR, 'input[type="image"][src="imagens/botoes/entrar.jpg"]'
+        ).click()
+        driver.implicitly_wait(1)
+        if not is_login_successful(driver):
+            raise ValueError("Wrong CPF or Password.")
+    except Exception:
+        driver.quit()
+        raise
+    return driver
+
+
+def is_login_successful(driver: webdriver.Chrome) -> bool:
+    """
+    Check if the login was successful by verifying the presence of an element.
+
+    Parameters:
+        driver (webdriver.Chrome): The WebDriver used to log in.
+
+    Returns:
+        bool: True if login is successful, otherwise False.
+    """
+    try:
+        driver.find_element(By.XPATH, '//tr[@onclick="changeDisplayS(17,18);"]')
+        return True
+    except Exception:
+        return False
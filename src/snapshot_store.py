@@ -0,0 +1,304 @@
+import contextlib
+import hashlib
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import config
+from logs import general_log
+from transcript_schema import apply_transcript_schema
+
+SNAPSHOT_COLUMN = "SNAPSHOT"
+
+
+def hash_dataframe(df: pd.DataFrame) -> str:
+    """
+    Compute a content hash of a DataFrame, independent of its index.
+
+    Parameters:
+        df (pd.DataFrame): The DataFrame to hash.
+
+    Returns:
+        str: The SHA-256 hex digest of the row hashes and column names.
+    """
+    digest = hashlib.sha256("\x1f".join(map(str, df.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class SnapshotStore:
+    """
+    A class to persist every scraped transcript as a Parquet snapshot.
+
+    Snapshots are partitioned as `student=<id>/date=<YYYY-MM-DD>/<HHMMSS>_<hash>.parquet`
+    and listed in an `index.json` file holding their timestamp, content hash, row count
+    and whether they were synchronized to Notion.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Initialize the SnapshotStore.
+
+        Parameters:
+            root (Optional[str]): The store directory. Defaults to `snapshots.dir` in the config.
+        """
+        if root is None:
+            if getattr(sys, "frozen", False):
+                base_path = os.path.dirname(sys.executable)
+            else:
+                base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+            root = os.path.join(
+                base_path, config.get("snapshots", {}).get("dir", "data/snapshots")
+            )
+        self.root = root
+        self.index_path = os.path.join(root, self.INDEX_FILE)
+        self._lock = threading.Lock()
+
+    def save(
+        self, df: pd.DataFrame, student_id: str, taken_at: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Persist a scraped transcript, skipping the write when it equals the latest snapshot.
+
+        Parameters:
+            df (pd.DataFrame): The scraped transcript.
+            student_id (str): Identifies the student.
+            taken_at (Optional[datetime]): The scrape time. Defaults to now.
+
+        Returns:
+            Dict[str, Any]: The index entry describing the stored (or reused) snapshot.
+        """
+        taken_at = taken_at or datetime.now()
+        content_hash = hash_dataframe(df)
+        with self._lock:
+            index = self._read_index()
+            latest = self._latest_entry(index, student_id)
+            if latest and latest["hash"] == content_hash:
+                general_log.logger.info(
+                    f"Snapshot for {student_id} unchanged since {latest['taken_at']}."
+                )
+                return latest
+
+            relative_path = os.path.join(
+                f"student={student_id}",
+                f"date={taken_at:%Y-%m-%d}",
+                f"{taken_at:%H%M%S}_{content_hash[:12]}.parquet",
+            )
+            file_path = os.path.join(self.root, relative_path)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            df.to_parquet(file_path, index=False)
+
+            entry = {
+                "student": student_id,
+                "taken_at": taken_at.isoformat(timespec="seconds"),
+                "path": relative_path,
+                "hash": content_hash,
+                "rows": len(df),
+                "compacted": False,
+                "synced": False,
+            }
+            index.append(entry)
+            self._write_index(index)
+        general_log.logger.info(f"Snapshot for {student_id} saved to {relative_path}.")
+        return entry
+
+    def load_latest(
+        self,
+        student_id: str,
+        columns: Optional[List[str]] = None,
+        synced_only: bool = False,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Load the most recent snapshot of a student.
+
+        Parameters:
+            student_id (str): Identifies the student.
+            columns (Optional[List[str]]): The columns to read. Reads every column if None.
+            synced_only (bool): Only consider snapshots already synchronized to Notion.
+
+        Returns:
+            Optional[pd.DataFrame]: The snapshot, or None if the student has none.
+        """
+        with self._lock:
+            latest = self._latest_entry(self._read_index(), student_id, synced_only)
+        return self._read_entry(latest, columns) if latest else None
+
+    def mark_synced(self, entry: Dict[str, Any]) -> None:
+        """
+        Record that a snapshot was synchronized to Notion.
+
+        Parameters:
+            entry (Dict[str, Any]): The index entry returned by `save`.
+        """
+        with self._lock:
+            index = self._read_index()
+            for stored in index:
+                if (
+                    stored["student"] == entry["student"]
+                    and stored["taken_at"] == entry["taken_at"]
+                ):
+                    stored["synced"] = True
+            self._write_index(index)
+
+    def load_range(
+        self,
+        student_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Load every snapshot of a student taken within a time range.
+
+        Parameters:
+            student_id (str): Identifies the student.
+            start (Optional[datetime]): The inclusive lower bound. Unbounded if None.
+            end (Optional[datetime]): The inclusive upper bound. Unbounded if None.
+            columns (Optional[List[str]]): The columns to read. Reads every column if None.
+
+        Returns:
+            pd.DataFrame: The snapshots, with their timestamp in the SNAPSHOT column.
+        """
+        with self._lock:
+            entries = [
+                entry
+                for entry in self._read_index()
+                if entry["student"] == student_id
+                and (start is None or entry["taken_at"] >= start.isoformat())
+                and (end is None or entry["taken_at"] <= end.isoformat())
+            ]
+        frames = [
+            self._read_entry(entry, columns).assign(**{SNAPSHOT_COLUMN: entry["taken_at"]})
+            for entry in entries
+        ]
+        if not frames:
+            return pd.DataFrame()
+        return apply_transcript_schema(pd.concat(frames, ignore_index=True))
+
+    def compact(self, older_than_days: Optional[int] = None) -> int:
+        """
+        Merge the snapshots older than the retention window into one file per student.
+
+        Parameters:
+            older_than_days (Optional[int]): The age, in days, after which snapshots are
+                compacted. Defaults to `snapshots.compact_after_days` in the config.
+
+        Returns:
+            int: The number of snapshot files merged.
+        """
+        if older_than_days is None:
+            older_than_days = config.get("snapshots", {}).get("compact_after_days", 30)
+        cutoff = (datetime.now() - timedelta(days=older_than_days)).isoformat()
+        merged = 0
+        with self._lock:
+            index = self._read_index()
+            by_student: Dict[str, List[Dict[str, Any]]] = {}
+            for entry in index:
+                if entry["taken_at"] < cutoff and not entry["compacted"]:
+                    by_student.setdefault(entry["student"], []).append(entry)
+
+            for student_id, entries in by_student.items():
+                if len(entries) < 2:
+                    continue
+                relative_path = os.path.join(
+                    f"student={student_id}",
+                    f"compacted_{datetime.now():%Y%m%d_%H%M%S}.parquet",
+                )
+                frames = [
+                    self._read_entry(entry).assign(**{SNAPSHOT_COLUMN: entry["taken_at"]})
+                    for entry in entries
+                ]
+                pd.concat(frames, ignore_index=True).to_parquet(
+                    os.path.join(self.root, relative_path), index=False
+                )
+                for entry in entries:
+                    file_path = os.path.join(self.root, entry["path"])
+                    os.remove(file_path)
+                    with contextlib.suppress(OSError):
+                        os.rmdir(os.path.dirname(file_path))
+                    entry["path"] = relative_path
+                    entry["compacted"] = True
+                merged += len(entries)
+            self._write_index(index)
+        general_log.logger.info(f"Compacted {merged} snapshots.")
+        return merged
+
+    def _read_entry(
+        self, entry: Dict[str, Any], columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Read the rows of one snapshot.
+
+        Parameters:
+            entry (Dict[str, Any]): The index entry of the snapshot.
+            columns (Optional[List[str]]): The columns to read. Reads every column if None.
+
+        Returns:
+            pd.DataFrame: The snapshot rows.
+        """
+        file_path = os.path.join(self.root, entry["path"])
+        if not entry["compacted"]:
+            return pd.read_parquet(file_path, columns=columns)
+        read_columns = None if columns is None else columns + [SNAPSHOT_COLUMN]
+        df = pd.read_parquet(
+            file_path,
+            columns=read_columns,
+            filters=[(SNAPSHOT_COLUMN, "==", entry["taken_at"])],
+        )
+        return df.drop(columns=SNAPSHOT_COLUMN)
+
+    def _latest_entry(
+        self, index: List[Dict[str, Any]], student_id: str, synced_only: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the most recent index entry of a student.
+
+        Parameters:
+            index (List[Dict[str, Any]]): The index entries.
+            student_id (str): Identifies the student.
+            synced_only (bool): Only consider entries already synchronized to Notion.
+
+        Returns:
+            Optional[Dict[str, Any]]: The latest entry, or None if the student has none.
+        """
+        entries = [
+            entry
+            for entry in index
+            if entry["student"] == student_id
+            and (not synced_only or entry.get("synced", False))
+        ]
+        return max(entries, key=lambda entry: entry["taken_at"]) if entries else None
+
+    def _read_index(self) -> List[Dict[str, Any]]:
+        """
+        Read the snapshot index.
+
+        Returns:
+            List[Dict[str, Any]]: The index entries, empty if the store is new.
+        """
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    def _write_index(self, index: List[Dict[str, Any]]) -> None:
+        """
+        Atomically replace the snapshot index.
+
+        Parameters:
+            index (List[Dict[str, Any]]): The index entries.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        temporary_path = f"{self.index_path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(index, file, indent=4)
+        os.replace(temporary_path, self.index_path)
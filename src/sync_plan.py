@@ -0,0 +1,172 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from payload_compiler import compile_create_payloads, compile_update_payloads
+
+POSITION_COLUMN = "POSITION"
+MAIN_PRIORITY = ["AP", "DU", "DI", "RR"]
+RR_PRIORITY = ["RR"]
+
+
+@dataclass(frozen=True)
+class PlannedOperation:
+    """
+    One Notion operation of a sync plan.
+
+    Attributes:
+        kind (str): "update" an existing page, "create" a new one, or "orphan" for a page
+            left without a scraped row.
+        code (str): The course code.
+        page_id (Optional[str]): The page to update, or the orphan page. None for creates.
+        data (Optional[Dict[str, Any]]): The compiled Notion properties to send. None for orphans.
+    """
+
+    kind: str
+    code: str
+    page_id: Optional[str] = None
+    data: Optional[Dict[str, Any]] = None
+
+
+def sort_by_priority(rows: pd.DataFrame, res_priority: list[str]) -> pd.DataFrame:
+    """
+    Sort the attempts of a code by 'RES' priority and then by 'NOTA', highest first.
+
+    Parameters:
+        rows (DataFrame): The attempts to sort.
+        res_priority (list[str]): The priority order of the 'RES' values.
+
+    Returns:
+        DataFrame: The sorted attempts.
+    """
+    res_priority_map = {res: idx for idx, res in enumerate(res_priority)}
+    return rows.assign(
+        RES_PRIORITY=rows["RES"].astype(object).map(res_priority_map)
+    ).sort_values(by=["RES_PRIORITY", "NOTA"], ascending=[True, False], kind="stable")
+
+
+def assign_code(
+    code: str,
+    rows: pd.DataFrame,
+    page_ids: list[str],
+    page_periods: Mapping[str, str],
+    update_payloads: List[Dict[str, Any]],
+    create_payloads: Optional[List[Dict[str, Any]]],
+) -> list[PlannedOperation]:
+    """
+    Match the sorted attempts of one code to its existing pages.
+
+    A page already holding the attempt's PERÍODO keeps it. The remaining attempts take the
+    remaining pages in priority order, and attempts left without a page are created if
+    `create_payloads` is given. Pages left without an attempt become orphans.
+
+    Parameters:
+        code (str): The course code.
+        rows (DataFrame): The attempts of the code, in priority order, with their POSITION.
+        page_ids (list[str]): The existing pages of the code, in index order.
+        page_periods (Mapping[str, str]): The PERÍODO currently held by each page.
+        update_payloads (List[Dict[str, Any]]): The update properties of every row, by position.
+        create_payloads (Optional[List[Dict[str, Any]]]): The create properties of every row,
+            by position, or None if attempts without a page are not created.
+
+    Returns:
+        list[PlannedOperation]: The operations of the code.
+    """
+    pages_by_period: dict[str, deque] = {}
+    for page_id in page_ids:
+        if period := page_periods.get(page_id):
+            pages_by_period.setdefault(period, deque()).append(page_id)
+    free_pages = deque(page_ids)
+    assigned: set[str] = set()
+    operations, unmatched = [], []
+
+    for period, position in zip(
+        rows["PERÍODO"].astype(str).tolist(), rows[POSITION_COLUMN].tolist()
+    ):
+        candidates = pages_by_period.get(period)
+        if candidates:
+            page_id = candidates.popleft()
+            assigned.add(page_id)
+            operations.append(
+                PlannedOperation("update", code, page_id, update_payloads[position])
+            )
+        else:
+            unmatched.append(position)
+
+    for position in unmatched:
+        while free_pages and free_pages[0] in assigned:
+            free_pages.popleft()
+        if free_pages:
+            page_id = free_pages.popleft()
+            assigned.add(page_id)
+            operations.append(
+                PlannedOperation("update", code, page_id, update_payloads[position])
+            )
+        elif create_payloads is not None:
+            operations.append(
+                PlannedOperation("create", code, None, create_payloads[position])
+            )
+
+    operations.extend(
+        PlannedOperation("orphan", code, page_id)
+        for page_id in page_ids
+        if page_id not in assigned
+    )
+    return operations
+
+
+def plan_sync(
+    df: pd.DataFrame,
+    page_code_map: Mapping[str, Union[str, list[str]]],
+    res_priority: list[str],
+    create_missing: bool,
+    page_periods: Optional[Mapping[str, str]] = None,
+) -> list[PlannedOperation]:
+    """
+    Plan the updates, creates and orphans that mirror the scraped rows into a Notion database.
+
+    The plan is computed without touching `page_code_map` or Notion, and its operations
+    target distinct pages, so they can be executed in any order. The payloads of every row
+    are compiled in one pass beforehand.
+
+    Parameters:
+        df (DataFrame): The scraped rows to mirror.
+        page_code_map (Mapping): The existing page IDs of each code.
+        res_priority (list[str]): The priority order of the 'RES' values.
+        create_missing (bool): Whether attempts without a page are created.
+        page_periods (Optional[Mapping[str, str]]): The PERÍODO currently held by each page.
+
+    Returns:
+        list[PlannedOperation]: The operations, grouped by code.
+    """
+    page_periods = page_periods or {}
+    df = df.assign(**{POSITION_COLUMN: np.arange(len(df))})
+    update_payloads = compile_update_payloads(df)
+    create_payloads = compile_create_payloads(df) if create_missing else None
+    rows_by_code = {
+        str(code): group
+        for code, group in df.groupby("CÓDIGO", observed=True, sort=False)
+    }
+    codes = list(page_code_map)
+    if create_missing:
+        codes += [code for code in rows_by_code if code not in page_code_map]
+
+    operations = []
+    for code in codes:
+        page_ids = page_code_map.get(code, [])
+        page_ids = page_ids if isinstance(page_ids, list) else [page_ids]
+        rows = rows_by_code.get(code, df.iloc[0:0])
+        operations.extend(
+            assign_code(
+                code,
+                sort_by_priority(rows, res_priority),
+                page_ids,
+                page_periods,
+                update_payloads,
+                create_payloads,
+            )
+        )
+    return operations
@@ -0,0 +1,299 @@
+import re
+import time
+import unicodedata
+from html.parser import HTMLParser
+from typing import Any, Iterable, List, Optional, Sequence
+
+from logs import general_log
+
+_WHITESPACE = re.compile(r"[ \t\n\r\f]+")
+_INLINE_WHITESPACE = re.compile(r"[ \t\r\f]+")
+
+_HELPERS_SCRIPT = """
+const isVisible = (el) =>
+    !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+const normalize = (text) =>
+    text
+        .split("\\n")
+        .map((line) => line.replace(/[ \\t\\r\\f]+/g, " ").replace(/^ +| +$/g, ""))
+        .filter((line) => line.length)
+        .join("\\n")
+        .replace(/\\u00a0/g, " ");
+const cellText = (cell) => (isVisible(cell) ? normalize(cell.innerText) : "");
+"""
+
+TRANSCRIPT_SCRIPT = (
+    _HELPERS_SCRIPT
+    + """
+const signature = arguments[0];
+const fold = (text) =>
+    text.normalize("NFD").replace(/[\\u0300-\\u036f]/g, "").trim().toUpperCase();
+for (const table of document.querySelectorAll("table")) {
+    const rows = Array.from(table.rows, (row) => Array.from(row.cells, cellText));
+    const headerIndex = rows.findIndex((cells) => {
+        const labels = new Set(cells.map(fold));
+        return signature.every((label) => labels.has(label));
+    });
+    if (headerIndex >= 0) {
+        return rows.slice(headerIndex + 1);
+    }
+}
+return null;
+"""
+)
+
+
+class TranscriptParseError(ValueError):
+    """
+    Raised when the transcript table cannot be found or does not have the expected layout.
+    """
+
+
+def normalize_cell_text(text: str) -> str:
+    """
+    Normalize raw cell text the same way Selenium renders `WebElement.text`.
+
+    Line breaks are kept, runs of ordinary whitespace collapse to a single space, every
+    line is trimmed (non-breaking spaces are kept) and non-breaking spaces finally become
+    plain spaces.
+
+    Parameters:
+        text (str): The raw text collected from the cell.
+
+    Returns:
+        str: The normalized cell text.
+    """
+    lines = (_INLINE_WHITESPACE.sub(" ", line).strip(" ") for line in text.split("\n"))
+    return "\n".join(line for line in lines if line).replace("\xa0", " ")
+
+
+def fold_label(text: str) -> str:
+    """
+    Fold a header label for accent and case insensitive comparison.
+
+    Parameters:
+        text (str): The label to fold.
+
+    Returns:
+        str: The label without accents, trimmed and upper-cased.
+    """
+    decomposed = unicodedata.normalize("NFD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).strip().upper()
+
+
+class _TableRowParser(HTMLParser):
+    """
+    Streaming HTML parser that records the direct rows and cells of every table, mirroring
+    `table.rows` and `row.cells`.
+    """
+
+    _IGNORED_TAGS = {"script", "style"}
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.tables: List[List[List[List[str]]]] = []
+        self._open_tables: List[List[List[List[str]]]] = []
+        self._open_rows: List[tuple[int, List[List[str]]]] = []
+        self._open_cells: List[tuple[int, List[str]]] = []
+        self._ignored_depth = 0
+
+    @property
+    def _table_depth(self) -> int:
+        return len(self._open_tables)
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag in self._IGNORED_TAGS:
+            self._ignored_depth += 1
+        elif tag == "table":
+            table: List[List[List[str]]] = []
+            self.tables.append(table)
+            self._open_tables.append(table)
+        elif tag == "tr" and self._open_tables:
+            self._close_cells()
+            self._close_rows()
+            direct_cells: List[List[str]] = []
+            self._open_tables[-1].append(direct_cells)
+            self._open_rows.append((self._table_depth, direct_cells))
+        elif tag in ("td", "th") and self._open_rows:
+            self._close_cells()
+            cell: List[str] = []
+            depth, direct_cells = self._open_rows[-1]
+            if depth == self._table_depth:
+                direct_cells.append(cell)
+            self._open_cells.append((self._table_depth, cell))
+        elif tag == "br":
+            self._append_text("\n")
+
+    def handle_startendtag(self, tag: str, attrs: list) -> None:
+        if tag == "br":
+            self._append_text("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self._IGNORED_TAGS:
+            self._ignored_depth = max(self._ignored_depth - 1, 0)
+        elif tag in ("td", "th"):
+            self._close_cells()
+        elif tag == "tr":
+            self._close_cells()
+            self._close_rows()
+        elif tag == "table" and self._open_tables:
+            self._close_cells()
+            self._close_rows()
+            self._open_tables.pop()
+
+    def handle_data(self, data: str) -> None:
+        if not self._ignored_depth:
+            self._append_text(_WHITESPACE.sub(" ", data))
+
+    def _append_text(self, text: str) -> None:
+        for _, cell in self._open_cells:
+            cell.append(text)
+
+    def _close_cells(self) -> None:
+        while self._open_cells and self._open_cells[-1][0] >= self._table_depth:
+            self._open_cells.pop()
+
+    def _close_rows(self) -> None:
+        while self._open_rows and self._open_rows[-1][0] >= self._table_depth:
+            self._open_rows.pop()
+
+
+def _normalize_rows(rows: Iterable[Iterable[List[str]]]) -> List[List[str]]:
+    return [[normalize_cell_text("".join(cell)) for cell in row] for row in rows]
+
+
+class TranscriptTableLocator:
+    """
+    A class to pick the transcript table out of a page by its header signature.
+    """
+
+    def __init__(self, header_signature: Sequence[str]):
+        """
+        Initialize the TranscriptTableLocator with the labels the header row must contain.
+
+        Parameters:
+            header_signature (Sequence[str]): Header labels, compared ignoring case and accents.
+        """
+        self.signature = [fold_label(label) for label in header_signature]
+
+    def locate(self, tables: Iterable[List[List[str]]]) -> Optional[List[List[str]]]:
+        """
+        Return the rows following the header row of the first table matching the signature.
+
+        Parameters:
+            tables (Iterable[List[List[str]]]): The direct rows of every table on the page.
+
+        Returns:
+            Optional[List[List[str]]]: The transcript rows, or None if no table matches.
+        """
+        for rows in tables:
+            for index, cells in enumerate(rows):
+                labels = {fold_label(cell) for cell in cells}
+                if all(label in labels for label in self.signature):
+                    return rows[index + 1 :]
+        return None
+
+
+class TableExtractor:
+    """
+    A class to extract the transcript table rows of a page in a single round-trip.
+    """
+
+    def __init__(self, header_signature: Sequence[str] = ("PERÍODO", "CÓDIGO")):
+        """
+        Initialize the TableExtractor.
+
+        Parameters:
+            header_signature (Sequence[str]): Header labels identifying the transcript table.
+        """
+        self.locator = TranscriptTableLocator(header_signature)
+
+    def extract_transcript(self, driver: Any) -> List[List[str]]:
+        """
+        Extract only the transcript table rows from the page loaded by the given driver.
+
+        A live Selenium driver locates the table with one `execute_script` call; any other
+        driver exposing `page_source` (or a failing script) is parsed locally.
+
+        Parameters:
+            driver: Selenium WebDriver instance or any object exposing `page_source`.
+
+        Returns:
+            List[List[str]]: The rows following the transcript header.
+
+        Raises:
+            TranscriptParseError: If no table on the page matches the header signature.
+        """
+        start = time.perf_counter()
+        table_data = None
+        located = False
+        if hasattr(driver, "execute_script"):
+            try:
+                table_data = driver.execute_script(
+                    TRANSCRIPT_SCRIPT, self.locator.signature
+                )
+                located = True
+            except Exception as e:
+                general_log.logger.warning(
+                    f"Script extraction failed, falling back to page source parsing: {e}"
+                )
+        if not located:
+            tables = self.extract_tables_from_html(driver.page_source)
+            table_data = self.locator.locate(tables)
+        elapsed = time.perf_counter() - start
+        if table_data is None:
+            raise TranscriptParseError(
+                f"No table with header {self.locator.signature} found "
+                f"(searched in {elapsed * 1000:.1f} ms)."
+            )
+        general_log.logger.info(
+            f"Transcript table located with {len(table_data)} rows in {elapsed * 1000:.1f} ms."
+        )
+        return [[str(text) for text in row] for row in table_data]
+
+    def extract_transcript_from_html(self, html: str) -> List[List[str]]:
+        """
+        Extract only the transcript table rows from raw HTML.
+
+        Parameters:
+            html (str): The page source.
+
+        Returns:
+            List[List[str]]: The rows following the transcript header.
+
+        Raises:
+            TranscriptParseError: If no table on the page matches the header signature.
+        """
+        table_data = self.locator.locate(self.extract_tables_from_html(html))
+        if table_data is None:
+            raise TranscriptParseError(
+                f"No table with header {self.locator.signature} found."
+            )
+        return table_data
+
+    def extract_tables_from_html(self, html: str) -> List[List[List[str]]]:
+        """
+        Extract the direct rows and cells of every table in raw HTML.
+
+        Parameters:
+            html (str): The page source.
+
+        Returns:
+            List[List[List[str]]]: The rows of each table, in document order.
+        """
+        return [_normalize_rows(table) for table in self._parse(html).tables]
+
+    def _parse(self, html: str) -> _TableRowParser:
+        """
+        Run the table parser over raw HTML.
+
+        Parameters:
+            html (str): The page source.
+
+        Returns:
+            _TableRowParser: The parser holding the collected tables.
+        """
+        parser = _TableRowParser()
+        parser.feed(html)
+        parser.close()
+        return parser
@@ -0,0 +1,88 @@
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+TRANSCRIPT_SCHEMA = {
+    "CPF": "category",
+    "PERÍODO": "category",
+    "CÓDIGO": "category",
+    "RES": "category",
+    "NOTA": "Float32",
+    "CH": "Int16",
+}
+
+
+def apply_transcript_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast the transcript columns to their compact typed representation.
+
+    Codes, periods and results become categoricals, NOTA a nullable float32 and CH a
+    nullable int16; missing values are stored as `pd.NA`. Columns absent from the
+    DataFrame are ignored.
+
+    Parameters:
+        df (pd.DataFrame): The transcript DataFrame.
+
+    Returns:
+        pd.DataFrame: The DataFrame with the schema applied.
+    """
+    dtypes = {
+        column: dtype
+        for column, dtype in TRANSCRIPT_SCHEMA.items()
+        if column in df.columns
+    }
+    df = df.assign(
+        **{
+            column: pd.to_numeric(df[column], errors="coerce")
+            for column, dtype in dtypes.items()
+            if dtype != "category"
+        }
+    )
+    try:
+        return df.astype(dtypes)
+    except TypeError:
+        dtypes["CH"] = "Float32"
+        return df.astype(dtypes)
+
+
+def add_categories(df: pd.DataFrame, column: str, values: Any) -> None:
+    """
+    Make sure a categorical column accepts the given values before they are assigned.
+
+    Parameters:
+        df (pd.DataFrame): The transcript DataFrame, modified in place.
+        column (str): The column that will receive the values.
+        values: The values about to be assigned.
+    """
+    if isinstance(df[column].dtype, pd.CategoricalDtype):
+        missing = pd.Index(pd.unique(np.asarray(values))).difference(
+            df[column].cat.categories
+        )
+        if len(missing):
+            df[column] = df[column].cat.add_categories(missing)
+
+
+def to_json_value(value: Any) -> Any:
+    """
+    Translate a DataFrame scalar into a JSON serializable value.
+
+    Missing values (`pd.NA`, NaN, None) become None and NumPy scalars become Python ones.
+    Floats go through their shortest repr, so a float32 7.3 is sent as 7.3 rather than
+    7.300000190734863.
+
+    Parameters:
+        value: The scalar read from the DataFrame.
+
+    Returns:
+        The JSON serializable value.
+    """
+    if value is None or value is pd.NA or (
+        isinstance(value, (float, np.floating)) and np.isnan(value)
+    ):
+        return None
+    if isinstance(value, np.floating):
+        return float(str(value))
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
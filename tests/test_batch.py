@@ -0,0 +1,84 @@
+import os
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("selenium")
+pytest.importorskip("webdriver_manager")
+
+import batch
+from batch import STUDENT_COLUMN, run_batch
+
+TRANSCRIPT_PAGE = os.path.join(os.path.dirname(__file__), "fixtures", "siac", "transcript.html")
+FAILING_CPF = "00000000002"
+
+
+class SavedPageDriver:
+    """
+    Serves the saved transcript page to the scraper instead of a browser.
+    """
+
+    def __init__(self):
+        with open(TRANSCRIPT_PAGE, encoding="utf-8") as file:
+            self.page_source = file.read()
+
+    def get(self, url: str) -> None:
+        pass
+
+    def quit(self) -> None:
+        pass
+
+
+class FakeDriverPool:
+    def __init__(self):
+        self.sizes = []
+
+    def grow(self, size: int) -> None:
+        self.sizes.append(size)
+
+
+class StubLogin:
+    """
+    Logs every student in with a saved page, failing for one CPF and tracking concurrency.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+
+    def __call__(self, cpf: str, password: str) -> SavedPageDriver:
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.02)
+        with self.lock:
+            self.in_flight -= 1
+        if cpf == FAILING_CPF:
+            raise ValueError("Invalid credentials.")
+        return SavedPageDriver()
+
+
+@pytest.fixture
+def driver_pool(monkeypatch):
+    pool = FakeDriverPool()
+    monkeypatch.setattr(batch, "get_driver_pool", lambda: pool)
+    monkeypatch.setitem(batch.config, "scraper", {"backend": "selenium"})
+    return pool
+
+
+def test_failing_student_does_not_abort_the_batch(monkeypatch, driver_pool):
+    login = StubLogin()
+    monkeypatch.setattr(batch.siac_login, "login", login)
+    credentials = [(f"{index:011d}", "secret") for index in range(8)]
+
+    result = run_batch(credentials, concurrency=3)
+
+    assert result.failures == {FAILING_CPF: "Invalid credentials."}
+    assert sorted(result.data[STUDENT_COLUMN].unique()) == sorted(
+        cpf for cpf, _ in credentials if cpf != FAILING_CPF
+    )
+    assert len(result.data) == 7 * 4
+    assert driver_pool.sizes == [3]
+    assert 1 < login.peak <= 3
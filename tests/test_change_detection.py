@@ -0,0 +1,96 @@
+import pandas as pd
+
+from change_detection import detect_changes, select_changed_rows, select_removed_codes
+from sync_plan import MAIN_PRIORITY, PlannedOperation, plan_sync
+from transcript_schema import apply_transcript_schema
+
+
+def make_transcript(rows):
+    return apply_transcript_schema(
+        pd.DataFrame(rows, columns=["PERÍODO", "CÓDIGO", "NOTA", "CH", "RES"])
+    )
+
+
+def codes(frame):
+    return frame["CÓDIGO"].astype(str).tolist()
+
+
+def test_first_scrape_inserts_every_row():
+    current = make_transcript([["2022.1", "MATA02", 7.0, 90, "AP"]])
+    changes = detect_changes(None, current)
+    assert codes(changes.inserted) == ["MATA02"]
+    assert changes.changed.empty and changes.removed.empty
+
+
+def test_identical_scrapes_have_no_changes():
+    rows = [["2022.1", "MATA02", 7.0, 90, "AP"], ["2022.1", "MATA37", 5.0, 68, "AP"]]
+    assert detect_changes(make_transcript(rows), make_transcript(rows)).is_empty()
+
+
+def test_duplicate_code_in_a_period_is_keyed_by_occurrence():
+    previous = make_transcript(
+        [
+            ["2022.1", "MATA02", 3.0, 90, "RR"],
+            ["2022.1", "MATA02", 7.0, 90, "AP"],
+        ]
+    )
+    current = make_transcript(
+        [
+            ["2022.1", "MATA02", 3.0, 90, "RR"],
+            ["2022.1", "MATA02", 8.5, 90, "AP"],
+            ["2022.1", "MATA02", 5.0, 90, "AP"],
+        ]
+    )
+    changes = detect_changes(previous, current)
+    assert changes.changed["NOTA"].tolist() == [8.5]
+    assert changes.inserted["NOTA"].tolist() == [5.0]
+    assert changes.removed.empty
+
+
+def test_removed_rows_and_changed_codes_are_selected_whole():
+    previous = make_transcript(
+        [
+            ["2022.1", "MATA02", 3.0, 90, "RR"],
+            ["2022.1", "MATA37", 5.0, 68, "AP"],
+            ["2022.2", "MATA02", 7.0, 90, "AP"],
+        ]
+    )
+    current = make_transcript(
+        [
+            ["2022.1", "MATA02", 3.0, 90, "RR"],
+            ["2022.1", "MATA37", 5.0, 68, "AP"],
+        ]
+    )
+    changes = detect_changes(previous, current)
+    assert codes(changes.removed) == ["MATA02"]
+    assert changes.codes == {"MATA02"}
+    assert codes(select_changed_rows(current, changes)) == ["MATA02"]
+
+
+def test_code_that_disappears_reaches_the_plan_as_orphans():
+    previous = make_transcript(
+        [
+            ["2022.1", "MATA02", 7.0, 90, "AP"],
+            ["2022.1", "MATA37", 5.0, 68, "AP"],
+        ]
+    )
+    current = make_transcript([["2022.1", "MATA02", 7.0, 90, "AP"]])
+    changes = detect_changes(previous, current)
+    rows = select_changed_rows(current, changes)
+    removed_codes = select_removed_codes(current, changes)
+    assert rows.empty
+    assert removed_codes == {"MATA37"}
+
+    plan = plan_sync(rows, {"MATA37": ["page-a"]}, MAIN_PRIORITY, create_missing=False)
+    assert plan == [PlannedOperation("orphan", "MATA37", "page-a")]
+
+
+def test_code_with_remaining_attempts_is_not_removed():
+    previous = make_transcript(
+        [
+            ["2022.1", "MATA02", 3.0, 90, "RR"],
+            ["2022.2", "MATA02", 7.0, 90, "AP"],
+        ]
+    )
+    current = make_transcript([["2022.2", "MATA02", 7.0, 90, "AP"]])
+    assert select_removed_codes(current, detect_changes(previous, current)) == set()
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from course_equivalence import DEFAULT_COURSE_EQUIVALENCES, CourseEquivalenceEngine
+from transcript_schema import apply_transcript_schema
+
+
+def baseline_weighted_average(df: pd.DataFrame, course_mappings: dict) -> pd.DataFrame:
+    """
+    The per-mapping loop the scraper used before the engine, for a single student.
+    """
+    for target_code, source_codes in course_mappings.items():
+        filtered_rows = df[df["CÓDIGO"].isin(source_codes)].copy()
+        if filtered_rows.empty or filtered_rows["NOTA"].isna().all():
+            continue
+        total_ch = filtered_rows["CH"].sum()
+        weighted_sum = (filtered_rows["CH"] * filtered_rows["NOTA"]).sum()
+        weighted_avg = weighted_sum / total_ch if total_ch != 0 else 0
+
+        target = (df["CÓDIGO"] == target_code) & (df["RES"] == "DI")
+        if target.any():
+            df.loc[target, "NOTA"] = weighted_avg
+            df.loc[target, "CH"] = total_ch
+            df.loc[target, "RES"] = "AP" if weighted_avg >= 5 else "RR"
+    return df
+
+
+def build_mappings(rng: np.random.Generator, count: int) -> dict:
+    targets = [f"TGT{index:03d}" for index in range(count)]
+    pool = [f"SRC{index:03d}" for index in range(count)]
+    mappings = {}
+    for index, target in enumerate(targets):
+        sources = list(rng.choice(pool, size=rng.integers(1, 4)))
+        if index % 7 == 3:
+            sources.append(sources[0])
+        if index % 5 == 1:
+            sources.append(targets[rng.integers(0, count)])
+        mappings[target] = sources
+    return mappings
+
+
+def build_frame(rng: np.random.Generator, mappings: dict, students: int) -> pd.DataFrame:
+    codes = sorted({code for sources in mappings.values() for code in sources} | set(mappings))
+    rows = []
+    for student in range(students):
+        cpf = f"{student:011d}"
+        for code in rng.choice(codes, size=len(codes) * 3 // 4, replace=False):
+            for _ in range(rng.integers(1, 3)):
+                pending = code in mappings and rng.random() < 0.7
+                graded = not pending and rng.random() < 0.85
+                rows.append(
+                    {
+                        "CPF": cpf,
+                        "PERÍODO": f"202{rng.integers(0, 4)}.{rng.integers(1, 3)}",
+                        "CÓDIGO": code,
+                        "NOTA": round(float(rng.uniform(0, 10)), 1) if graded else np.nan,
+                        "CH": float(rng.choice([34, 51, 68, 85])),
+                        "RES": "DI" if pending else rng.choice(["AP", "RR", "--"]),
+                    }
+                )
+    return pd.DataFrame(rows)
+
+
+def assert_same_grades(result: pd.DataFrame, expected: pd.DataFrame) -> None:
+    np.testing.assert_allclose(
+        result["NOTA"].astype("float64").to_numpy(na_value=np.nan),
+        expected["NOTA"].astype("float64").to_numpy(),
+        rtol=1e-5,
+    )
+    assert result["CH"].astype("float64").tolist() == expected["CH"].tolist()
+    assert result["RES"].astype(str).tolist() == expected["RES"].tolist()
+
+
+def test_matches_baseline_loop_on_default_mappings():
+    df = pd.DataFrame(
+        {
+            "PERÍODO": ["2021.1", "2021.1", "2021.2", "2022.1", "2022.1", "2022.2", "2022.2"],
+            "CÓDIGO": ["FISD34", "FISD41", "FISD37", "FIS122", "FIS123", "FIS121", "FISD41"],
+            "NOTA": [6.0, 4.2, np.nan, np.nan, np.nan, np.nan, 8.1],
+            "CH": [68.0, 34.0, 68.0, 102.0, 102.0, 102.0, 34.0],
+            "RES": ["AP", "RR", "TR", "DI", "DI", "DI", "AP"],
+        }
+    )
+    expected = baseline_weighted_average(df.copy(), DEFAULT_COURSE_EQUIVALENCES)
+
+    result = CourseEquivalenceEngine(DEFAULT_COURSE_EQUIVALENCES).apply(
+        apply_transcript_schema(df)
+    )
+
+    assert_same_grades(result, expected)
+    assert result["RES"].astype(str).tolist()[3:6] == ["AP", "DI", "DI"]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_baseline_loop_per_student(seed):
+    rng = np.random.default_rng(seed)
+    mappings = build_mappings(rng, 300)
+    df = build_frame(rng, mappings, students=4)
+    expected = pd.concat(
+        baseline_weighted_average(student.copy(), mappings)
+        for _, student in df.groupby("CPF", sort=False)
+    ).loc[df.index]
+
+    result = CourseEquivalenceEngine(mappings).apply(apply_transcript_schema(df))
+
+    assert (expected["RES"] != df["RES"]).any()
+    assert_same_grades(result, expected)
+
+
+def test_chained_targets_follow_mapping_order():
+    df = pd.DataFrame(
+        {
+            "CÓDIGO": ["SRC1", "MID", "TOP", "LATE"],
+            "NOTA": [9.0, np.nan, np.nan, 3.0],
+            "CH": [60.0, 30.0, 90.0, 30.0],
+            "RES": ["AP", "DI", "DI", "DI"],
+        }
+    )
+    mappings = {"MID": ["SRC1"], "TOP": ["MID", "LATE"], "LATE": ["SRC1", "SRC1"]}
+    expected = baseline_weighted_average(df.copy(), mappings)
+
+    result = CourseEquivalenceEngine(mappings).apply(apply_transcript_schema(df))
+
+    assert_same_grades(result, expected)
+    assert result["NOTA"].tolist() == pytest.approx([9.0, 9.0, 7.0, 9.0])
@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("selenium")
+pytest.importorskip("webdriver_manager")
+
+from driver_pool import PooledDriver
+
+
+class FakeDriver:
+    page_source = "<html></html>"
+
+    def get(self, url: str) -> None:
+        self.url = url
+
+
+class FakePool:
+    def __init__(self):
+        self.released = []
+
+    def release(self, driver) -> None:
+        self.released.append(driver)
+
+
+def test_pooled_driver_forwards_until_quit():
+    driver, pool = FakeDriver(), FakePool()
+    pooled = PooledDriver(driver, pool)
+
+    pooled.get("https://siac.invalid")
+    assert driver.url == "https://siac.invalid"
+    assert pooled.page_source == "<html></html>"
+
+    pooled.quit()
+    pooled.quit()
+    assert pool.released == [driver]
+
+    with pytest.raises(RuntimeError):
+        pooled.page_source
+    with pytest.raises(RuntimeError):
+        pooled.get("https://siac.invalid")
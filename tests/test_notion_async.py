@@ -0,0 +1,81 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from services.notion_api import AsyncNotionRequestFactory, NotionRequestFactory
+
+REQUEST_DELAY = 0.05
+
+
+class StubNotionHandler(BaseHTTPRequestHandler):
+    """
+    Answers page updates after a short delay, recording how many were served at once.
+    """
+
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+    served = 0
+
+    def do_PATCH(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(REQUEST_DELAY)
+        with cls.lock:
+            cls.in_flight -= 1
+            cls.served += 1
+        body = json.dumps({"object": "page", "id": self.path.rsplit("/", 1)[-1]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def notion_url():
+    StubNotionHandler.in_flight = StubNotionHandler.peak = StubNotionHandler.served = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubNotionHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("max_in_flight", [1, 3])
+def test_updates_respect_max_in_flight(notion_url, max_in_flight):
+    config = {
+        "notion": {
+            "url": notion_url,
+            "pool_size": 10,
+            "rate_limit": {"rate": 1000, "burst": 1000},
+        },
+        "notion_login": {"token": f"stub-token-{max_in_flight}"},
+    }
+    notion_factory = NotionRequestFactory(config, "stub-db")
+    async_factory = AsyncNotionRequestFactory(notion_factory, max_in_flight)
+
+    async def update_all():
+        return await asyncio.gather(
+            *(
+                async_factory.update_page(f"page-{index}", {"NOTA": {"number": index}})
+                for index in range(12)
+            )
+        )
+
+    responses = asyncio.run(update_all())
+
+    assert [response.status_code for response in responses] == [200] * 12
+    assert StubNotionHandler.served == 12
+    assert StubNotionHandler.peak == max_in_flight
@@ -0,0 +1,31 @@
+import pytest
+
+from notion_targets import config, resolve_database_id
+
+
+@pytest.fixture(autouse=True)
+def notion_login(monkeypatch):
+    monkeypatch.setitem(
+        config,
+        "notion_login",
+        {"token": "secret", "main_db_id": "main-id", "extra_db_id": "extra-id"},
+    )
+
+
+def test_login_keys_resolve_to_their_database_id():
+    assert resolve_database_id("main_db_id") == "main-id"
+    assert resolve_database_id("extra_db_id") == "extra-id"
+
+
+def test_literal_notion_ids_are_kept():
+    assert resolve_database_id("0123456789abcdef0123456789abcdef") == (
+        "0123456789abcdef0123456789abcdef"
+    )
+    assert resolve_database_id("01234567-89ab-cdef-0123-456789abcdef") == (
+        "01234567-89ab-cdef-0123-456789abcdef"
+    )
+
+
+def test_unknown_names_are_rejected():
+    with pytest.raises(ValueError):
+        resolve_database_id("grades_db_id")
@@ -0,0 +1,73 @@
+import pytest
+
+from page_index import NotionPageIndex
+from services.notion_api import NotionAPIError
+
+
+def make_page(page_id, code, **flags):
+    return {
+        "id": page_id,
+        "properties": {
+            "CÓDIGO": {"type": "title", "title": [{"text": {"content": code}}]},
+            "NOTA": {"type": "number", "number": 7.0},
+        },
+        "created_time": f"2024-01-01T00:00:0{page_id[-1]}.000Z",
+        "last_edited_time": "2024-01-01T00:00:00.000Z",
+        **flags,
+    }
+
+
+class FakeFactory:
+    database_id = "db"
+
+    def __init__(self, pages, error=None):
+        self.pages = pages
+        self.error = error
+        self.queries = []
+
+    def get_property_ids(self, names):
+        return [f"id-{name}" for name in names]
+
+    def iter_pages(self, num_pages=None, filter=None, filter_properties=None):
+        self.queries.append({"filter": filter, "filter_properties": filter_properties})
+        yield from self.pages
+        if self.error:
+            raise self.error
+
+
+@pytest.fixture
+def index(tmp_path):
+    return NotionPageIndex(str(tmp_path / "index.sqlite"))
+
+
+def test_refresh_only_downloads_the_title_and_tracked_properties(index):
+    factory = FakeFactory([make_page("page-1", "MATA02")])
+    index.refresh(factory)
+    assert factory.queries[0]["filter_properties"] == [
+        "title",
+        "id-NOTA",
+        "id-CH",
+        "id-PERÍODO",
+    ]
+    assert list(index.iter_page_codes("db")) == [("MATA02", "page-1")]
+    assert index.load_page_values("db") == {"page-1": {"NOTA": 7.0}}
+
+
+def test_failed_refresh_keeps_the_index(index):
+    index.refresh(FakeFactory([make_page("page-1", "MATA02")]))
+    failing = FakeFactory(
+        [make_page("page-2", "MATA37")], NotionAPIError("Failed", 500, "boom")
+    )
+    with pytest.raises(NotionAPIError):
+        index.refresh(failing)
+    assert list(index.iter_page_codes("db")) == [("MATA02", "page-1")]
+
+    incremental = FakeFactory([])
+    index.refresh(incremental)
+    assert incremental.queries[0]["filter"] is not None
+
+
+def test_incremental_refresh_drops_trashed_pages(index):
+    index.refresh(FakeFactory([make_page("page-1", "MATA02"), make_page("page-2", "MATA37")]))
+    index.refresh(FakeFactory([make_page("page-2", "MATA37", in_trash=True)]))
+    assert list(index.iter_page_codes("db")) == [("MATA02", "page-1")]
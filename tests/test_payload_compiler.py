@@ -0,0 +1,56 @@
+import pandas as pd
+
+from payload_compiler import compile_create_payloads, compile_update_payloads
+from transcript_schema import apply_transcript_schema
+
+
+def make_transcript(rows):
+    return apply_transcript_schema(
+        pd.DataFrame(rows, columns=["PERÍODO", "CÓDIGO", "NOTA", "CH", "RES"])
+    )
+
+
+def test_placeholder_result_sends_minus_one_and_no_workload():
+    df = make_transcript([["2022.1", "LETA09", None, 68, "--"]])
+    assert compile_update_payloads(df) == [
+        {
+            "NOTA": {"number": -1},
+            "PERÍODO": {"rich_text": [{"text": {"content": "2022.1"}}]},
+        }
+    ]
+
+
+def test_missing_values_are_dropped_from_updates():
+    df = make_transcript(
+        [
+            ["2022.1", "MATA02", 7.3, None, "AP"],
+            [None, "MATA37", None, None, "AP"],
+        ]
+    )
+    assert compile_update_payloads(df) == [
+        {
+            "NOTA": {"number": 7.3},
+            "PERÍODO": {"rich_text": [{"text": {"content": "2022.1"}}]},
+        },
+        {},
+    ]
+
+
+def test_float32_grades_use_their_shortest_repr():
+    df = make_transcript([["2022.1", "MATA02", 7.3, 90, "AP"]])
+    assert df["NOTA"].dtype == "Float32"
+    (payload,) = compile_update_payloads(df)
+    assert payload["NOTA"] == {"number": 7.3}
+    assert payload["CH"] == {"number": 90}
+    assert type(payload["CH"]["number"]) is int
+
+
+def test_create_payloads_keep_missing_values():
+    df = make_transcript([["2022.1", "MATA37", None, 68, "RR"]])
+    assert compile_create_payloads(df) == [
+        {
+            "CÓDIGO": {"title": [{"text": {"content": "MATA37"}}]},
+            "NOTA": {"number": None},
+            "CH": {"number": 68},
+        }
+    ]
@@ -0,0 +1,136 @@
+from types import SimpleNamespace
+
+import pytest
+
+from services import notion_api, rate_limiter
+from services.notion_api import NotionAdapter
+from services.rate_limiter import TokenBucket
+
+
+class FakeClock:
+    """
+    A monotonic clock that only moves when something sleeps.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeSession:
+    """
+    Answers every request with the next canned status code, recording the calls.
+    """
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append(method)
+        status_code, headers = self.responses.pop(0)
+        return SimpleNamespace(status_code=status_code, headers=headers)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    fake_time = SimpleNamespace(monotonic=clock.monotonic, sleep=clock.sleep)
+    monkeypatch.setattr(rate_limiter, "time", fake_time)
+    monkeypatch.setattr(notion_api, "time", fake_time)
+    return clock
+
+
+def make_adapter(session: FakeSession) -> NotionAdapter:
+    adapter = NotionAdapter(
+        {
+            "notion": {
+                "url": "https://notion.invalid/v1",
+                "rate_limit": {"max_retries": 3},
+            },
+            "notion_login": {"token": "fake-clock-token"},
+        }
+    )
+    adapter.session = session
+    adapter.rate_limiter = TokenBucket(rate=100, burst=100)
+    return adapter
+
+
+def test_bucket_spends_burst_then_waits_for_refill(clock):
+    bucket = TokenBucket(rate=2, burst=2)
+
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.5]
+    assert clock.now == 0.5
+
+    clock.now += 10
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.5]
+    assert bucket.metrics() == {
+        "requests": 6,
+        "throttled_requests": 2,
+        "throttled_seconds": 1.0,
+        "retries": 0,
+    }
+
+
+def test_pause_holds_every_caller(clock):
+    bucket = TokenBucket(rate=10, burst=5)
+
+    bucket.pause(3)
+    bucket.pause(1)
+
+    assert bucket.acquire() == 3.0
+    assert clock.now == 3.0
+    assert bucket.acquire() == 0.0
+
+
+def test_throttled_request_waits_for_retry_after(clock):
+    session = FakeSession((429, {"Retry-After": "2"}), (200, {}))
+    adapter = make_adapter(session)
+
+    response = adapter.request("PATCH", "/pages/page-1", json={})
+
+    assert response.status_code == 200
+    assert session.calls == ["PATCH", "PATCH"]
+    assert clock.now == 2.0
+    assert adapter.rate_limiter.metrics()["retries"] == 1
+
+
+def test_server_error_is_not_retried_for_post(clock):
+    session = FakeSession((503, {}), (200, {}))
+    adapter = make_adapter(session)
+
+    response = adapter.request("POST", "/pages", json={})
+
+    assert response.status_code == 503
+    assert session.calls == ["POST"]
+    assert clock.sleeps == []
+
+
+def test_server_error_is_retried_with_backoff_for_patch(clock):
+    session = FakeSession((503, {}), (502, {}), (200, {}))
+    adapter = make_adapter(session)
+
+    response = adapter.request("PATCH", "/pages/page-1", json={})
+
+    assert response.status_code == 200
+    assert session.calls == ["PATCH"] * 3
+    assert len(clock.sleeps) == 2
+    for attempt, delay in enumerate(clock.sleeps):
+        assert 0 <= delay <= adapter.backoff_base * 2**attempt
+
+
+def test_retries_stop_after_max_retries(clock):
+    session = FakeSession(*[(503, {})] * 4)
+    adapter = make_adapter(session)
+
+    response = adapter.request("GET", "/databases/db")
+
+    assert response.status_code == 503
+    assert len(session.calls) == adapter.max_retries + 1
@@ -0,0 +1,57 @@
+import os
+
+import pandas as pd
+import pytest
+
+from replay import SOURCE_COLUMN, parse_saved_page, replay
+from scraper import Scraper
+from table_extractor import TranscriptParseError
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "siac")
+TRANSCRIPT_PAGE = os.path.join(FIXTURES_DIR, "transcript.html")
+EMPTY_PAGE = os.path.join(FIXTURES_DIR, "transcript_empty.html")
+
+
+class SavedPageDriver:
+    """
+    Serves a saved page to the live scraping path, like a driver without `execute_script`.
+    """
+
+    def __init__(self, file_path: str):
+        with open(file_path, encoding="utf-8") as file:
+            self.page_source = file.read()
+        self.visited = []
+
+    def get(self, url: str) -> None:
+        self.visited.append(url)
+
+    def quit(self) -> None:
+        pass
+
+
+def scrape_live(file_path: str) -> pd.DataFrame:
+    driver = SavedPageDriver(file_path)
+    df = Scraper(driver).scrape_table()
+    assert driver.visited
+    return df
+
+
+def test_saved_page_replays_to_the_live_frame():
+    live = scrape_live(TRANSCRIPT_PAGE)
+
+    replayed = parse_saved_page(TRANSCRIPT_PAGE)
+
+    assert replayed[SOURCE_COLUMN].unique().tolist() == ["transcript.html"]
+    pd.testing.assert_frame_equal(replayed.drop(columns=SOURCE_COLUMN), live)
+
+
+def test_page_without_rows_is_a_parse_error():
+    with pytest.raises(TranscriptParseError):
+        parse_saved_page(EMPTY_PAGE)
+
+
+def test_replay_reports_failed_pages():
+    data, failures, _ = replay([TRANSCRIPT_PAGE, EMPTY_PAGE], workers=2)
+
+    assert list(failures) == [EMPTY_PAGE]
+    assert data["CÓDIGO"].astype(str).tolist() == ["MATA02", "MATA37", "MATA37", "LETA09"]
@@ -0,0 +1,102 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+from scraper import Scraper
+from services.siac_http import SiacHttpSession
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "siac")
+CPF = "12345678900"
+PASSWORD = "secret"
+SESSION_COOKIE = "JSESSIONID=stand-in"
+
+
+def read_fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as file:
+        return file.read()
+
+
+class StandInSiacHandler(BaseHTTPRequestHandler):
+    """
+    Serves the saved SIAC login, home and transcript pages, checking the login form fields
+    and the session cookie like SIAC does.
+    """
+
+    def do_GET(self):
+        if self.path == "/SiacWWW/Welcome.do":
+            self._send(200, read_fixture("login.html"))
+        elif self.path == "/SiacWWW/ConsultarCoeficienteRendimento.do":
+            if SESSION_COOKIE in (self.headers.get("Cookie") or ""):
+                self._send(200, read_fixture("transcript.html"))
+            else:
+                self._send(200, read_fixture("login.html"))
+        else:
+            self._send(404, b"")
+
+    def do_POST(self):
+        if self.path != "/SiacWWW/LogonDiscente.do":
+            self._send(404, b"")
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode("utf-8"))
+        if form.get("token") == ["a1b2c3"] and form.get("cpf") == [CPF] and form.get(
+            "senha"
+        ) == [PASSWORD]:
+            self._send(200, read_fixture("home.html"), cookie=SESSION_COOKIE)
+        else:
+            self._send(200, read_fixture("login.html"))
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, cookie: str = None):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if cookie:
+            self.send_header("Set-Cookie", f"{cookie}; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def siac_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInSiacHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/SiacWWW/"
+    server.shutdown()
+    server.server_close()
+
+
+def make_session(siac_url: str) -> SiacHttpSession:
+    return SiacHttpSession(
+        {"siac": {"login_url": f"{siac_url}Welcome.do"}, "timeout": {"page_load": 5}}
+    )
+
+
+def test_login_and_parse_transcript(siac_url):
+    session = make_session(siac_url)
+    session.login(CPF, PASSWORD)
+    assert session.is_logged_in()
+
+    session.get(f"{siac_url}ConsultarCoeficienteRendimento.do")
+    df = Scraper(session, CPF).parse_page_source(session.page_source)
+    session.quit()
+
+    assert df["CÓDIGO"].astype(str).tolist() == ["MATA02", "MATA37", "MATA37", "LETA09"]
+    assert df["PERÍODO"].astype(str).tolist() == ["2022.1", "2022.1", "2022.2", "2022.2"]
+    assert df["RES"].astype(str).tolist() == ["AP", "RR", "AP", "--"]
+    assert df["NOTA"].iloc[0] == pytest.approx(7.3)
+    assert df["CH"].iloc[1] == 68
+    assert df["NOTA"].isna().iloc[3]
+
+
+def test_login_rejects_wrong_password(siac_url):
+    session = make_session(siac_url)
+    with pytest.raises(ValueError):
+        session.login(CPF, "wrong")
+    assert not session.is_logged_in()
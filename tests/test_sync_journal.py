@@ -0,0 +1,82 @@
+import pytest
+
+from services.sync_journal import SyncJournal
+
+OPERATIONS = [
+    ("create", "db-main", "MATA02", {"NOTA": {"number": 7.3}}),
+    ("create", "db-main", "MATA37", {"NOTA": {"number": 8.0}}),
+    ("update", "db-main", "page-1", {"NOTA": {"number": 4.5}}),
+    ("update", "db-main", "page-2", {"NOTA": {"number": 6.1}}),
+]
+
+
+class Interrupted(Exception):
+    pass
+
+
+def run_sync(journal: SyncJournal, operations, sent: list, interrupt_at=None) -> None:
+    """
+    Send the operations the way notion_update does: begin, send, then complete.
+    """
+    for kind, database_id, target, data in operations:
+        key = journal.begin(kind, database_id, target, data)
+        if key is None:
+            continue
+        if (kind, target) == interrupt_at:
+            raise Interrupted
+        sent.append((kind, target))
+        journal.complete(key)
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return str(tmp_path / "sync_journal.sqlite")
+
+
+def test_rerun_after_interruption_resumes_pending_operations(journal_path):
+    sent = []
+    with pytest.raises(Interrupted):
+        run_sync(SyncJournal(journal_path), OPERATIONS, sent, ("update", "page-1"))
+
+    run_sync(SyncJournal(journal_path), OPERATIONS, sent)
+
+    assert sent == [
+        ("create", "MATA02"),
+        ("create", "MATA37"),
+        ("update", "page-1"),
+        ("update", "page-2"),
+    ]
+
+
+def test_operation_interrupted_before_complete_is_sent_again(journal_path):
+    journal = SyncJournal(journal_path)
+    journal.begin(*OPERATIONS[0])
+
+    sent = []
+    run_sync(SyncJournal(journal_path), OPERATIONS[:1], sent)
+
+    assert sent == [("create", "MATA02")]
+
+
+def test_repeated_operation_in_a_run_is_sent_each_time(journal_path):
+    operations = [OPERATIONS[2], OPERATIONS[3], OPERATIONS[2]]
+    sent = []
+    with pytest.raises(Interrupted):
+        run_sync(SyncJournal(journal_path), operations, sent, ("update", "page-2"))
+
+    run_sync(SyncJournal(journal_path), operations, sent)
+
+    assert sent == [("update", "page-1"), ("update", "page-2"), ("update", "page-1")]
+
+
+def test_clear_only_forgets_the_given_database(journal_path):
+    other = [("create", "db-rr", "MATA37", {"PERÍODO": {"number": 2022.2}})]
+    journal = SyncJournal(journal_path)
+    run_sync(journal, OPERATIONS + other, [])
+
+    journal.clear("db-main")
+
+    assert journal.begin(*OPERATIONS[0]).endswith(":0")
+    sent = []
+    run_sync(SyncJournal(journal_path), OPERATIONS + other, sent)
+    assert sent == [(kind, target) for kind, _, target, _ in OPERATIONS]
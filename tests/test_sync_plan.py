@@ -0,0 +1,98 @@
+import pandas as pd
+
+from sync_plan import MAIN_PRIORITY, RR_PRIORITY, PlannedOperation, plan_sync
+from transcript_schema import apply_transcript_schema
+
+
+def make_transcript(rows):
+    return apply_transcript_schema(
+        pd.DataFrame(rows, columns=["PERÍODO", "CÓDIGO", "NOTA", "CH", "RES"])
+    )
+
+
+def by_kind(plan, kind):
+    return [operation for operation in plan if operation.kind == kind]
+
+
+def test_page_holding_the_period_keeps_its_attempt():
+    df = make_transcript(
+        [
+            ["2021.1", "MATA02", 3.0, 90, "RR"],
+            ["2021.2", "MATA02", 8.0, 90, "AP"],
+        ]
+    )
+    plan = plan_sync(
+        df,
+        {"MATA02": ["page-a", "page-b"]},
+        MAIN_PRIORITY,
+        create_missing=False,
+        page_periods={"page-a": "2021.1", "page-b": "2021.2"},
+    )
+    periods = {
+        operation.page_id: operation.data["PERÍODO"]["rich_text"][0]["text"]["content"]
+        for operation in by_kind(plan, "update")
+    }
+    assert periods == {"page-a": "2021.1", "page-b": "2021.2"}
+
+
+def test_unmatched_attempts_take_free_pages_by_priority():
+    df = make_transcript(
+        [
+            ["2021.1", "MATA02", 3.0, 90, "RR"],
+            ["2021.2", "MATA02", 8.0, 90, "AP"],
+        ]
+    )
+    plan = plan_sync(df, {"MATA02": ["page-a"]}, MAIN_PRIORITY, create_missing=False)
+    assert plan == [
+        PlannedOperation(
+            "update",
+            "MATA02",
+            "page-a",
+            {
+                "NOTA": {"number": 8.0},
+                "CH": {"number": 90},
+                "PERÍODO": {"rich_text": [{"text": {"content": "2021.2"}}]},
+            },
+        )
+    ]
+
+
+def test_period_match_wins_over_priority():
+    df = make_transcript(
+        [
+            ["2021.1", "MATA02", 3.0, 90, "RR"],
+            ["2021.2", "MATA02", 8.0, 90, "AP"],
+        ]
+    )
+    plan = plan_sync(
+        df,
+        {"MATA02": ["page-a"]},
+        MAIN_PRIORITY,
+        create_missing=False,
+        page_periods={"page-a": "2021.1"},
+    )
+    (update,) = by_kind(plan, "update")
+    assert update.data["NOTA"] == {"number": 3.0}
+
+
+def test_leftover_pages_are_orphans_and_missing_pages_are_created():
+    df = make_transcript([["2021.1", "MATA37", 4.5, 68, "RR"]])
+    plan = plan_sync(
+        df,
+        {"MATA02": ["page-a"]},
+        RR_PRIORITY,
+        create_missing=True,
+    )
+    assert by_kind(plan, "orphan") == [PlannedOperation("orphan", "MATA02", "page-a")]
+    (create,) = by_kind(plan, "create")
+    assert create.code == "MATA37"
+    assert create.data == {
+        "CÓDIGO": {"title": [{"text": {"content": "MATA37"}}]},
+        "NOTA": {"number": 4.5},
+        "CH": {"number": 68},
+    }
+
+
+def test_missing_pages_are_not_created_for_the_main_table():
+    df = make_transcript([["2021.1", "MATA37", 4.5, 68, "RR"]])
+    assert plan_sync(df, {}, MAIN_PRIORITY, create_missing=False) == []
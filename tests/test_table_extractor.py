@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from benchmarks.extraction_benchmark import legacy_extract_transcript
+from table_extractor import TableExtractor, TranscriptParseError
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "siac")
+FIXTURE_PAGES = ["transcript.html", "transcript_markup.html"]
+
+EXPECTED_MARKUP_ROWS = [
+    ["2022.1", "MATA02", "CÁLCULO A", "90", "6", "7.3", "90", "6", "AP"],
+    ["", "MATA37", "INTRODUÇÃO À\nLÓGICA DE PROGRAMAÇÃO", "68", "4", "4.5", "0", "0", "RR"],
+    ["2022.2", "LETA09", "OFICINA DE LEITURA & PRODUÇÃO", "--", "--", "--", "--", "--", "--"],
+    ["Total Geral"],
+]
+
+
+def fixture_path(name: str) -> str:
+    return os.path.join(FIXTURES_DIR, name)
+
+
+def read_fixture(name: str) -> str:
+    with open(fixture_path(name), encoding="utf-8") as file:
+        return file.read()
+
+
+def test_html_parser_extracts_transcript_rows():
+    rows = TableExtractor().extract_transcript_from_html(read_fixture("transcript_markup.html"))
+
+    assert rows == EXPECTED_MARKUP_ROWS
+
+
+def test_html_parser_rejects_page_without_transcript():
+    with pytest.raises(TranscriptParseError):
+        TableExtractor().extract_transcript_from_html(
+            "<table><tr><td>Histórico Escolar</td></tr></table>"
+        )
+
+
+@pytest.fixture(scope="module")
+def driver():
+    webdriver = pytest.importorskip("selenium.webdriver")
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    try:
+        chrome = webdriver.Chrome(options=options)
+    except Exception as e:
+        pytest.skip(f"Chrome is not available: {e}")
+    yield chrome
+    chrome.quit()
+
+
+@pytest.mark.parametrize("page", FIXTURE_PAGES)
+def test_extractors_match_legacy_per_cell_output(driver, page):
+    extractor = TableExtractor()
+    driver.get(f"file://{os.path.abspath(fixture_path(page))}")
+
+    legacy = legacy_extract_transcript(driver, extractor.locator)
+
+    assert legacy
+    assert extractor.extract_transcript(driver) == legacy
+    assert extractor.extract_transcript_from_html(read_fixture(page)) == legacy